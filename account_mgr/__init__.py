@@ -2,26 +2,27 @@ import os
 import logging
 from flask_babel import Babel
 from dotenv import load_dotenv
-from sqlalchemy import inspect
 from flask_mailman import Mail
-from datetime import timedelta
 from flask_bcrypt import Bcrypt
 from flask_caching import Cache
-from alembic.config import Config
 from flask_limiter import Limiter
 from flask_migrate import Migrate
-from .ansi_ import get_color_support
+from .logging_ import setup_logging, request_logger
+from .headers_ import compile_security_headers, csp_nonce
+from .session_ import setup_sessions
+from .assets_ import setup_assets
+from .lazy_ import setup_import_budget
+from .metrics_ import setup_metrics
 from flask_wtf.csrf import CSRFProtect
 from flask_sqlalchemy import SQLAlchemy
 from config import DevConfig, ProdConfig
-from alembic.script import ScriptDirectory
 from flask_limiter.util import get_remote_address
-from flask_session import Session as FlaskSession
+from functools import partial
+from werkzeug.local import LocalProxy
 from werkzeug.exceptions import RequestEntityTooLarge
-from alembic.runtime.environment import EnvironmentContext
 from account_mgr.access_control.form import AccessControlForm
 from flask_login import login_manager, LoginManager, current_user
-from flask import Flask, request, redirect, url_for, session, flash
+from flask import Flask, request, redirect, url_for, session, flash, g
 from account_mgr.search.form import TransactionReportForm, CashSummaryForm
 
 
@@ -35,6 +36,10 @@ else:
     app.config.from_object(DevConfig)
 
 
+# Registered before any extension so its timer wraps every request hook
+setup_metrics(app)
+
+
 mail = Mail(app)
 babel = Babel(app)
 cache = Cache(app)
@@ -49,27 +54,24 @@ login_manager.init_app(app)
 login_manager.login_message_category = "super_admin_secure.secure_superlogin"
 
 
-app.config["SESSION_SQLALCHEMY"] = db
-flask_session = FlaskSession(app)
-
-
-@app.before_request
-def make_session_permanent():
-    session.permanent = True
-    app.permanent_session_lifetime = timedelta(days=4)
+session_interface = setup_sessions(app, db)
 
 
-logging.basicConfig(level=logging.DEBUG)
-colors = get_color_support()
+setup_logging(app)
+default_headers, header_sets, static_headers = compile_security_headers(app.config)
+app.jinja_env.globals["csp_nonce"] = csp_nonce
+setup_assets(app)
+setup_import_budget(app)
 
 
 @app.before_request
 def middleware():
     """Middleware to handle request path validation and URL canonicalization."""
-    if not request.path.startswith("/static"):
-        endpoint = request.endpoint or "NO_ENDPOINT"
-        print(
-            f"{colors['GREEN']}middleware executes before: '{endpoint}' route.{colors['RESET']}"
+    if request_logger.isEnabledFor(logging.DEBUG) and not request.path.startswith(
+        "/static"
+    ):
+        request_logger.debug(
+            "middleware executes before: '%s' route.", request.endpoint or "NO_ENDPOINT"
         )
     try:
         # Check for valid request path format (starts with a slash)
@@ -89,7 +91,7 @@ def middleware():
             return redirect(location=request.path.rstrip("/"))
 
     except ValueError as e:
-        app.logger.error(msg="Middleware error: {e}, Request Path: {request.path}")
+        app.logger.error(msg=f"Middleware error: {e}, Request Path: {request.path}")
         session["error_message"] = (
             f"Middleware error: {e}, Request Path: {request.path}"
         )
@@ -100,83 +102,17 @@ def middleware():
 
 @app.after_request
 def security_headers(response):
-    if not request.path.startswith("/static"):
-        endpoint = request.endpoint or "NO_ENDPOINT"
-        print(
-            f"{colors['GREEN']}security header executes before: '{endpoint}' route. {colors['RESET']}"
-        )
+    if request.endpoint == "static":
+        return static_headers.apply(response)
 
-    # 🔒 Security Headers
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"  # Prevent clickjacking
-    response.headers["Strict-Transport-Security"] = (
-        "max-age=31536000; includeSubDomains"
-    )
-
-    # 🔒 Content Security Policy (CSP)
-    response.headers["Content-Security-Policy"] = (
-        "default-src 'self'; "
-        "base-uri 'self'; "
-        "form-action 'self'; "
-        "frame-ancestors 'none'; "
-        "object-src 'none'; "
-        "block-all-mixed-content; "
-        "upgrade-insecure-requests; "
-        "manifest-src 'self'; "
-        "media-src 'self'; "
-        "worker-src 'self'; "
-        "child-src 'self'; "
-        "script-src-attr 'none'; "
-        "report-uri /csp-violation-report-endpoint/; "
-        "report-to csp-endpoint; "
-        # ✅ Scripts
-        "script-src 'self' "
-        "https://cdn.jsdelivr.net "
-        "https://cdnjs.cloudflare.com "
-        "https://unpkg.com "
-        "https://accounts.google.com "
-        "https://apis.google.com; "
-        # ✅ Styles
-        "style-src 'self' "
-        "https://cdn.jsdelivr.net "
-        "https://cdnjs.cloudflare.com; "
-        # ✅ Fonts
-        "font-src 'self' "
-        "https://cdnjs.cloudflare.com; "
-        # ✅ Images
-        "img-src 'self' blob: data:; "
-        # ✅ Connections (XHR, fetch, WebSockets, APIs)
-        "connect-src 'self' "
-        "https://cdn.jsdelivr.net "
-        "https://cdnjs.cloudflare.com "
-        "https://unpkg.com "
-        "https://accounts.google.com "
-        "https://apis.google.com; "
-    )
-
-    # 🔒 Permissions Policy (disable dangerous APIs by default)
-    response.headers["Permissions-Policy"] = (
-        "accelerometer=(), "
-        "autoplay=(), "
-        "camera=(), "
-        "display-capture=(), "
-        "encrypted-media=(), "
-        "fullscreen=(self), "
-        "geolocation=(), "
-        "gyroscope=(), "
-        "magnetometer=(), "
-        "microphone=(), "
-        "midi=(), "
-        "payment=(), "
-        "picture-in-picture=(self), "
-        "publickey-credentials-get=(), "
-        "screen-wake-lock=(), "
-        "sync-xhr=(), "
-        "usb=(), "
-        "xr-spatial-tracking=()"
-    )
+    if request_logger.isEnabledFor(logging.DEBUG):
+        request_logger.debug(
+            "security header executes before: '%s' route.",
+            request.endpoint or "NO_ENDPOINT",
+        )
 
+    # 🔒 Security headers, prebuilt from config at startup
+    header_sets.get(request.blueprint, default_headers).apply(response)
     return response
 
 
@@ -222,10 +158,42 @@ def inject_logout_url():
 
 @app.context_processor
 def inject_user_profile_image():
-    image_file = None
+    from account_mgr.database.models import user_image_cache_key
+    from account_mgr.media_utils.utils import avatar_urls
+
+    image_file, avatar = None, None
     if current_user.is_authenticated:
-        image_file = url_for("static", filename="media/" + current_user.user_profile)
-    return dict(image_file=image_file)
+        key = user_image_cache_key(current_user.user_profile)
+        cached = cache.get(key)
+        if cached is None:
+            avatar, complete = avatar_urls(current_user.user_profile)
+            cached = (avatar["lg"][0], avatar)
+            # Variants may still be rendering; look again a little sooner
+            timeout = app.config["USER_CACHE_TIMEOUT"] if complete else 5
+            cache.set(key, cached, timeout=timeout)
+        image_file, avatar = cached
+    return dict(image_file=image_file, avatar=avatar)
+
+
+# Forms every layout page can show; built on first use, once per request
+DEFAULT_FORMS = {
+    "report": TransactionReportForm,
+    "summary_form": CashSummaryForm,
+    "access_form": AccessControlForm,
+}
+
+
+def default_form(name):
+    """Build the named default form the first time this request needs it."""
+    forms = g.setdefault("default_forms", {})
+    if name not in forms:
+        forms[name] = DEFAULT_FORMS[name]()
+    return forms[name]
+
+
+DEFAULT_FORM_PROXIES = {
+    name: LocalProxy(partial(default_form, name)) for name in DEFAULT_FORMS
+}
 
 
 @app.context_processor
@@ -236,11 +204,9 @@ def inject_default_forms():
         if request.method == "GET" or request.content_length < app.config.get(
             "MAX_CONTENT_LENGTH", 10 * 1024 * 1024
         ):
-            return {
-                "report": TransactionReportForm(),
-                "summary_form": CashSummaryForm(),
-                "access_form": AccessControlForm(),
-            }
+            # Lazy proxies: pages that never touch these forms skip
+            # field binding and CSRF token generation entirely
+            return DEFAULT_FORM_PROXIES
     except RequestEntityTooLarge:
         # In case request.content_length is already too big
         pass
@@ -251,13 +217,6 @@ def inject_default_forms():
     return {}
 
 
-def flask_db_init():
-    """Function to initialize Flask-Migrate and create the migrations folder."""
-    migrations_folder = os.path.join(os.getcwd(), "migrations")
-    if not os.path.exists(path=migrations_folder):
-        os.system(command="flask db init")
-
-
 """ Importing blueprints and routes from different modules."""
 from account_mgr.errors.routes import errors_
 from account_mgr.api.routes import meter_cash_api
@@ -280,20 +239,22 @@ app.register_blueprint(super_admin_secure, url_prefix="/")
 app.register_blueprint(attendants_registration, url_prefix="/")
 
 
-def init_db():
-    """Initialize database by creating tables and seeding super admin."""
-    from .super_admin.routes import seed_super_admin
+from account_mgr.database.startup import prepare_database
+from account_mgr.database.slow_queries import setup_slow_query_log
 
+
+setup_slow_query_log()
+
+
+def init_db():
+    """Migrate and seed the database unless another worker already has."""
     with app.app_context():
-        flask_db_init()
-        db.create_all() 
-        seed_super_admin()
-        app.logger.info("Database initialized and super admin seeded.")
+        prepare_database()
 
 
 # Safe initialization on Render startup
-try:
-    with app.app_context():
+if app.config["AUTO_MIGRATE"]:
+    try:
         init_db()
-except Exception as e:
-    app.logger.error(f"❌ Failed to initialize DB on startup: {e}")
+    except Exception as e:
+        app.logger.error(f"❌ Failed to initialize DB on startup: {e}")
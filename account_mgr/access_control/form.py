@@ -1,5 +1,5 @@
 from flask_wtf import FlaskForm
-from wtforms.validators import DataRequired
+from wtforms.validators import DataRequired, Optional
 from wtforms import (
     DateField,
     SubmitField,
@@ -43,7 +43,8 @@ class AccessControlForm(FlaskForm):
     end_date = DateField(
         label="End Date", format="%Y-%m-%d", validators=[DataRequired()]
     )
-    admin_pin = PasswordField(validators=[DataRequired()])
+    # Blank while an earlier PIN check's grant is still active
+    admin_pin = PasswordField(validators=[Optional()])
     submit = SubmitField(label="Grant Access")
 
 
@@ -0,0 +1,143 @@
+import os
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from flask import session
+from flask_login import current_user
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from account_mgr import app, bcrypt
+
+
+logger = logging.getLogger(__name__)
+
+# Session key holding the signed elevated-access grant
+GRANT_KEY = "_pin_grant"
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+# ---------- BCRYPT POOL ----------
+def _get_executor():
+    """
+    Process-wide pool for bcrypt checks. PIN_CHECK_WORKERS caps the CPU
+    they take; PIN_CHECK_QUEUE caps how many may be running or waiting.
+    """
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config["PIN_CHECK_WORKERS"],
+                thread_name_prefix="pin-check",
+            )
+            _slots = threading.BoundedSemaphore(app.config["PIN_CHECK_QUEUE"])
+        return _executor, _slots
+
+
+def _forget_executor():
+    global _executor, _slots
+    _executor = _slots = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_executor)
+
+
+def check_pin(password_hash, pin):
+    """
+    Check `pin` against `password_hash` on the bcrypt pool. Returns None,
+    instead of queueing without bound, when the pool is saturated or the
+    check takes longer than PIN_CHECK_TIMEOUT.
+    """
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        logger.warning("PIN check rejected: bcrypt pool is saturated")
+        return None
+
+    future = executor.submit(bcrypt.check_password_hash, password_hash, pin)
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=app.config["PIN_CHECK_TIMEOUT"])
+    except TimeoutError:
+        logger.warning("PIN check timed out")
+        return None
+
+
+# ---------- GRANTS ----------
+def _grant_serializer():
+    return URLSafeTimedSerializer(app.config["SECRET_KEY"], salt="pin-grant")
+
+
+def _password_fingerprint(user):
+    # Changing the password invalidates any grant issued before it
+    return hashlib.sha256(user.password.encode("utf-8")).hexdigest()[:16]
+
+
+def issue_grant():
+    """Record a successful PIN check for PIN_GRANT_TTL seconds."""
+    session[GRANT_KEY] = _grant_serializer().dumps(
+        {"uid": current_user.id, "pw": _password_fingerprint(current_user)}
+    )
+
+
+def has_grant():
+    """True while the current user holds an unexpired elevated-access grant."""
+    token = session.get(GRANT_KEY)
+    if not token or not current_user.is_authenticated:
+        return False
+
+    try:
+        grant = _grant_serializer().loads(token, max_age=app.config["PIN_GRANT_TTL"])
+    except BadSignature:
+        # Expired or tampered with
+        session.pop(GRANT_KEY, None)
+        return False
+
+    return (
+        grant.get("uid") == current_user.id
+        and grant.get("pw") == _password_fingerprint(current_user)
+    )
+
+
+def revoke_grant():
+    session.pop(GRANT_KEY, None)
+
+
+# ---------- EDIT TOKENS ----------
+def _edit_serializer():
+    return URLSafeTimedSerializer(app.config["SECRET_KEY"], salt="session-edit")
+
+
+def issue_edit_token(session_id):
+    """
+    Signed permission to save one closing session, put in its edit form
+    when the form is opened, so a slow edit outlives the PIN grant.
+    """
+    return _edit_serializer().dumps(
+        {
+            "sid": session_id,
+            "uid": current_user.id,
+            "pw": _password_fingerprint(current_user),
+        }
+    )
+
+
+def has_edit_token(token, session_id):
+    """True if `token` lets the current user save `session_id`."""
+    if not token or not current_user.is_authenticated:
+        return False
+
+    try:
+        grant = _edit_serializer().loads(
+            token, max_age=app.config["SESSION_EDIT_TTL"]
+        )
+    except BadSignature:
+        return False
+
+    return (
+        grant.get("sid") == session_id
+        and grant.get("uid") == current_user.id
+        and grant.get("pw") == _password_fingerprint(current_user)
+    )
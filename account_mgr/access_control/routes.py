@@ -1,7 +1,8 @@
-from account_mgr import bcrypt, db
+from account_mgr import db
 from flask_login import current_user
 from flask_wtf.csrf import validate_csrf, CSRFError
 from .form import AccessControlForm, DailyReportForm
+from .pin import check_pin, has_grant, issue_grant
 from account_mgr.database.models import ClosingSession, DailyReport
 from flask import render_template, Blueprint, redirect, flash, url_for, request
 
@@ -75,9 +76,24 @@ def verify_pin():
     pin = request.form.get("pin", "")
 
     if not current_user or not current_user.password:
-        return {"valid": False}
+        return {"valid": False, "granted": False}
 
-    return {"valid": bcrypt.check_password_hash(current_user.password, pin)}
+    # ✅ No PIN: only report whether a recent check's grant is still active,
+    # so the modal can skip the prompt without running bcrypt
+    if not pin:
+        return {"valid": False, "granted": has_grant()}
+
+    valid = check_pin(current_user.password, pin)
+    if valid is None:
+        return {
+            "valid": False,
+            "granted": has_grant(),
+            "error": "Too many PIN checks, try again",
+        }, 429
+
+    if valid:
+        issue_grant()
+    return {"valid": valid, "granted": has_grant()}
 
 
 @access_control_bp.route(rule="/account_mgr/access_control", methods=["GET", "POST"])
@@ -89,14 +105,29 @@ def access_control():
         admin_pin = form.admin_pin.data
 
         # ✅ Validate password BEFORE doing anything else
-        if not current_user or not current_user.password or not admin_pin:
+        if not current_user or not current_user.password:
             flash(message="Admin PIN required", category="danger")
             return redirect(url_for(endpoint="super_admin_secure.secure_adashboard"))
 
-        # ✅ Use Bcrypt to verify
-        if not bcrypt.check_password_hash(current_user.password, admin_pin):
-            flash(message="Invalid Admin PIN", category="error")
-            return redirect(url_for(endpoint="super_admin_secure.secure_adashboard"))
+        # ✅ A blank PIN relies on an active grant; an entered one is checked
+        if admin_pin or not has_grant():
+            if not admin_pin:
+                flash(message="Admin PIN required", category="danger")
+                return redirect(
+                    url_for(endpoint="super_admin_secure.secure_adashboard")
+                )
+            valid = check_pin(current_user.password, admin_pin)
+            if valid is None:
+                flash(message="Too many PIN checks, try again", category="error")
+                return redirect(
+                    url_for(endpoint="super_admin_secure.secure_adashboard")
+                )
+            if not valid:
+                flash(message="Invalid Admin PIN", category="error")
+                return redirect(
+                    url_for(endpoint="super_admin_secure.secure_adashboard")
+                )
+            issue_grant()
 
         # ✅ PIN correct — continue
         access_type = form.access.data.lower()
@@ -1,7 +1,7 @@
 from flask_login import logout_user
 from account_mgr import db, bcrypt, app
 from flask_mailman import EmailMessage
-from account_mgr.database.models import User
+from account_mgr.database.models import User, invalidate_user
 from flask_login import current_user, login_required
 from account_mgr.media_utils.utils import save_user_picture
 from .form import UpdateAccount, RequestResetForm, ResetPasswordForm
@@ -48,6 +48,7 @@ def secure_account_update():
         # Preserve role before logout
         user_role = current_user.user_role
         is_super_admin = current_user.is_super_admin
+        invalidate_user(current_user.id)
         db.session.commit()
         flash(
             message="Your account has been updated!"
@@ -132,6 +133,7 @@ def reset_token(token):
     if form.validate_on_submit():
         hashed_pwd = bcrypt.generate_password_hash(form.password.data).decode("utf-8")
         user.password = hashed_pwd
+        invalidate_user(user.id)
         db.session.commit()
         flash(message="Your password has been updated", category="success")
 
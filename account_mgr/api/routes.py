@@ -1,5 +1,6 @@
 from account_mgr import db
-from sqlalchemy import func
+from sqlalchemy.orm import aliased
+from sqlalchemy import func, select
 from datetime import datetime, date
 from flask_login import login_required
 from flask import jsonify, request, Blueprint
@@ -19,81 +20,115 @@ meter_cash_api = Blueprint(
 )
 
 
-@meter_cash_api.route(rule="/get_meter_total")
-@login_required
-def get_meter_total():
-    section = request.args.get(key="section", default="S1S2")
+# Closing columns of the latest reading, returned as the next opening values
+OPENING_FIELDS = {
+    MeterReading: {
+        "super_1_opening": "super_1_closing",
+        "super_2_opening": "super_2_closing",
+    },
+    D14Reading: {
+        "d1_opening": "d1_closing",
+        "d2_opening": "d2_closing",
+        "d3_opening": "d3_closing",
+        "d4_opening": "d4_closing",
+    },
+}
+
+
+def session_snapshot(section):
+    """
+    Today's figures for a section in one query: the latest closing session,
+    its latest meter/diesel reading and its credit transaction.
+    """
+    reading = D14Reading if section.upper() == "D1D4" else MeterReading
+    opening_fields = OPENING_FIELDS[reading]
+
+    latest = aliased(reading)
+    latest_reading_id = (
+        select(func.max(latest.id))
+        .where(latest.session_id == ClosingSession.id)
+        .scalar_subquery()
+    )
 
-    closing_session = (
-        ClosingSession.query.filter_by(section=section, session_date=date.today())
+    row = (
+        db.session.query(
+            ClosingSession.id,
+            reading.total,
+            CreditTransaction.total_credit,
+            CreditTransaction.total_collection,
+            CreditTransaction.cash_to_bank,
+            *[getattr(reading, col) for col in opening_fields.values()],
+        )
+        .select_from(ClosingSession)
+        .outerjoin(reading, reading.id == latest_reading_id)
+        .outerjoin(
+            CreditTransaction, CreditTransaction.session_id == ClosingSession.id
+        )
+        .filter(
+            ClosingSession.section == section,
+            ClosingSession.session_date == date.today(),
+        )
         .order_by(ClosingSession.id.desc())
         .first()
     )
 
-    if not closing_session:
-        return jsonify({"meter_total": 0})
+    if not row:
+        return {
+            "section": section,
+            "session_id": None,
+            "meter_total": 0,
+            "cash_to_bank": 0,
+            "total_credit": 0,
+            "total_collection": 0,
+            "opening": dict.fromkeys(opening_fields, 0),
+        }
+
+    session_id, meter_total, total_credit, total_collection, cash_to_bank = row[:5]
+    closing = row[5:]
+    meter_total_value = float(meter_total) if meter_total else 0
+
+    return {
+        "section": section,
+        "session_id": session_id,
+        "meter_total": meter_total_value,
+        # Fall back to the meter total until credit transactions are saved
+        "cash_to_bank": (
+            float(cash_to_bank) if cash_to_bank is not None else meter_total_value
+        ),
+        "total_credit": float(total_credit or 0),
+        "total_collection": float(total_collection or 0),
+        "opening": {
+            key: float(value or 0) for key, value in zip(opening_fields, closing)
+        },
+    }
+
+
+@meter_cash_api.route(rule="/api/session_snapshot")
+@login_required
+def get_session_snapshot():
+    section = request.args.get(key="section", default="S1S2")
 
-    if section.upper() == "D1D4":
-        meter_total = (
-            db.session.query(D14Reading.total)
-            .filter_by(session_id=closing_session.id)
-            .order_by(D14Reading.id.desc())
-            .first()
-        )
-    else:
-        meter_total = (
-            db.session.query(MeterReading.total)
-            .filter_by(session_id=closing_session.id)
-            .order_by(MeterReading.id.desc())
-            .first()
-        )
+    response = jsonify(session_snapshot(section))
 
-    meter_total_value = float(meter_total[0]) if meter_total and meter_total[0] else 0
-    return jsonify({"meter_total": meter_total_value})
+    # Let the dashboard revalidate cheaply: unchanged snapshots return a 304
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.add_etag()
+    return response.make_conditional(request)
 
 
-@meter_cash_api.route(rule="/get_cash_to_bank")
+@meter_cash_api.route(rule="/get_meter_total")
 @login_required
-def get_cash_to_bank():
+def get_meter_total():
     section = request.args.get(key="section", default="S1S2")
+    return jsonify({"meter_total": session_snapshot(section)["meter_total"]})
 
-    closing_session = (
-        ClosingSession.query.filter_by(section=section, session_date=date.today())
-        .order_by(ClosingSession.id.desc())
-        .first()
-    )
-
-    if not closing_session:
-        return jsonify({"cash_to_bank": 0})
 
-    latest_transaction = (
-        CreditTransaction.query.filter_by(session_id=closing_session.id)
-        .order_by(CreditTransaction.id.desc())
-        .first()
-    )
-
-    if latest_transaction and latest_transaction.cash_to_bank is not None:
-        cash_to_bank_value = float(latest_transaction.cash_to_bank)
-    else:
-        if section.upper() == "D1D4":
-            meter_total = (
-                db.session.query(D14Reading.total)
-                .filter_by(session_id=closing_session.id)
-                .order_by(D14Reading.id.desc())
-                .first()
-            )
-        else:
-            meter_total = (
-                db.session.query(MeterReading.total)
-                .filter_by(session_id=closing_session.id)
-                .order_by(MeterReading.id.desc())
-                .first()
-            )
-        cash_to_bank_value = (
-            float(meter_total[0]) if meter_total and meter_total[0] else 0
-        )
-
-    return jsonify({"cash_to_bank": cash_to_bank_value})
+@meter_cash_api.route(rule="/get_cash_to_bank")
+@login_required
+def get_cash_to_bank():
+    section = request.args.get(key="section", default="S1S2")
+    return jsonify({"cash_to_bank": session_snapshot(section)["cash_to_bank"]})
 
 
 @meter_cash_api.route(rule="/get_meter_reading")
@@ -0,0 +1,247 @@
+import os
+import re
+import gzip
+import json
+import click
+import shutil
+import hashlib
+import logging
+import mimetypes
+import posixpath
+from flask import request, send_from_directory, url_for
+
+
+logger = logging.getLogger(__name__)
+
+# Build output, relative to the static folder
+ASSET_DIR = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Text assets worth shipping precompressed; fonts and images already are
+COMPRESSIBLE = (".css", ".js", ".svg", ".ico", ".json")
+
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+# ---------- MINIFY ----------
+def minify_css(source):
+    """Drop comments and layout whitespace; selectors and values are untouched."""
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    source = re.sub(r"\s+", " ", source)
+    source = re.sub(r"\s*([{};,])\s*", r"\1", source)
+    return source.replace(";}", "}").strip()
+
+
+def minify_js(source):
+    """
+    Drop indentation, blank lines and comments that take up whole lines.
+    Line breaks are kept, so automatic semicolon insertion and anything
+    inside strings behave exactly as before.
+    """
+    lines, in_comment = [], False
+    for line in source.splitlines():
+        line = line.strip()
+        if in_comment:
+            in_comment = "*/" not in line
+            continue
+        if line.startswith("/*"):
+            if "*/" not in line:
+                in_comment = True
+                continue
+            line = line.split("*/", 1)[1].strip()
+        if line and not line.startswith("//"):
+            lines.append(line)
+    return "\n".join(lines)
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+# ---------- BUILD ----------
+def _hashed_name(logical, data):
+    stem, ext = posixpath.splitext(logical)
+    return f"{ASSET_DIR}/{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def _compress(path, data):
+    """Write .gz (and .br when Brotli is installed) next to `path`."""
+    encodings = ["gzip"]
+    with open(f"{path}.gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+    except ImportError:
+        return encodings
+
+    with open(f"{path}.br", "wb") as f:
+        f.write(brotli.compress(data, quality=11))
+    return ["br", *encodings]
+
+
+class AssetBuild:
+    """
+    One run of `flask build-assets`: every file under ASSET_DIRS (and any
+    file their CSS points at) is copied to a content-hashed name, and each
+    bundle is minified and concatenated from its sources.
+    """
+
+    def __init__(self, static_folder, dirs, bundles):
+        self.static_folder = static_folder
+        self.dirs = dirs
+        self.bundles = bundles
+        self.files = {}
+        self.encodings = {}
+
+    def _read(self, logical):
+        with open(os.path.join(self.static_folder, logical), "rb") as f:
+            return f.read()
+
+    def _rewrite_urls(self, logical, css):
+        """Point url()s at hashed copies, made on demand for images."""
+        base = posixpath.dirname(logical)
+
+        def replace(match):
+            url = match.group(2)
+            if re.match(r"^(data:|[a-z]+:|/|#)", url):
+                return match.group(0)
+            target = posixpath.normpath(posixpath.join(base, url.split("?")[0]))
+            if not os.path.isfile(os.path.join(self.static_folder, target)):
+                return match.group(0)
+            # The stylesheet itself lands one level deeper, under ASSET_DIR
+            hashed = self.add(target)
+            return f'url("{posixpath.relpath(hashed, f"{ASSET_DIR}/{base}")}")'
+
+        return CSS_URL.sub(replace, css)
+
+    def _render(self, logical):
+        data = self._read(logical)
+        ext = posixpath.splitext(logical)[1]
+        if ext in MINIFIERS:
+            text = data.decode("utf-8")
+            if ext == ".css":
+                text = self._rewrite_urls(logical, text)
+            data = MINIFIERS[ext](text).encode("utf-8")
+        return data
+
+    def _write(self, logical, data):
+        hashed = _hashed_name(logical, data)
+        path = os.path.join(self.static_folder, hashed)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        if hashed.endswith(COMPRESSIBLE):
+            self.encodings[hashed] = _compress(path, data)
+        self.files[logical] = hashed
+        return hashed
+
+    def add(self, logical):
+        if logical not in self.files:
+            self._write(logical, self._render(logical))
+        return self.files[logical]
+
+    def add_bundle(self, logical, sources):
+        parts = [self._render(source) for source in sources]
+        # A statement left open at the end of one script must not run on
+        joiner = b";\n" if logical.endswith(".js") else b"\n"
+        return self._write(logical, joiner.join(parts))
+
+    def run(self):
+        for folder in self.dirs:
+            root = os.path.join(self.static_folder, folder)
+            for dirpath, _, names in os.walk(root):
+                for name in sorted(names):
+                    path = os.path.join(dirpath, name)
+                    logical = os.path.relpath(path, self.static_folder)
+                    self.add(logical.replace(os.sep, "/"))
+        for logical, sources in self.bundles.items():
+            self.add_bundle(logical, sources)
+        return {"files": self.files, "encodings": self.encodings}
+
+
+def build_assets(static_folder, dirs, bundles):
+    """Rebuild ASSET_DIR from scratch and write its manifest."""
+    out = os.path.join(static_folder, ASSET_DIR)
+    shutil.rmtree(out, ignore_errors=True)
+    manifest = AssetBuild(static_folder, dirs, bundles).run()
+    if not any("br" in found for found in manifest["encodings"].values()):
+        logger.warning("Brotli is not installed; built gzip copies only")
+    with open(os.path.join(out, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+def load_manifest(static_folder):
+    try:
+        with open(os.path.join(static_folder, ASSET_DIR, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+# ---------- SERVE ----------
+def setup_assets(app):
+    """
+    Serve the fingerprinted build when there is one:
+
+    - url_for("static", filename=...) resolves to the hashed copy;
+    - `asset_urls(bundle)` gives the bundle, or its sources without a build;
+    - hashed files are sent precompressed with a year-long immutable
+      Cache-Control, so repeat page loads make no static requests.
+    """
+    bundles = app.config["ASSET_BUNDLES"]
+    manifest = None
+    if app.config["USE_ASSET_BUILD"]:
+        manifest = load_manifest(app.static_folder)
+        if manifest is None:
+            logger.warning("No asset build found; run `flask build-assets`")
+    files = manifest["files"] if manifest else {}
+    encodings = manifest["encodings"] if manifest else {}
+    hashed_files = set(files.values())
+    max_age = app.config["ASSET_MAX_AGE"]
+
+    @app.url_defaults
+    def fingerprint_static_urls(endpoint, values):
+        if endpoint == "static" and values.get("filename") in files:
+            values["filename"] = files[values["filename"]]
+
+    def asset_urls(name):
+        if name in files or name not in bundles:
+            return [url_for("static", filename=name)]
+        return [url_for("static", filename=source) for source in bundles[name]]
+
+    app.jinja_env.globals["asset_urls"] = asset_urls
+
+    send_static_file = app.view_functions["static"]
+
+    def static(filename):
+        if filename not in hashed_files:
+            return send_static_file(filename=filename)
+
+        sent, encoding = filename, None
+        for accepted in encodings.get(filename, ()):
+            if request.accept_encodings[accepted]:
+                sent = f"{filename}.{'br' if accepted == 'br' else 'gz'}"
+                encoding = accepted
+                break
+
+        response = send_from_directory(
+            app.static_folder,
+            sent,
+            mimetype=mimetypes.guess_type(filename)[0],
+            max_age=max_age,
+        )
+        response.cache_control.immutable = True
+        if encoding:
+            response.content_encoding = encoding
+        if filename in encodings:
+            response.vary.add("Accept-Encoding")
+        return response
+
+    app.view_functions["static"] = static
+
+    @app.cli.command("build-assets")
+    def build_assets_command():
+        """Fingerprint, bundle and precompress the static assets."""
+        manifest = build_assets(app.static_folder, app.config["ASSET_DIRS"], bundles)
+        out = os.path.join(app.static_folder, ASSET_DIR)
+        click.echo(f"Built {len(manifest['files'])} assets into {out}.")
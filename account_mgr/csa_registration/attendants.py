@@ -0,0 +1,40 @@
+from sqlalchemy import select
+from account_mgr import db
+from account_mgr.database.models import CSAName
+from account_mgr.database.versions import VersionedCache, bump_version
+
+
+# cache_versions row bumped whenever csanames changes
+ATTENDANTS_VERSION = "csanames"
+
+
+def _load_attendants():
+    rows = db.session.execute(
+        select(CSAName.id, CSAName.attendant_name).order_by(CSAName.id)
+    ).all()
+    return dict(rows)
+
+
+_attendants = VersionedCache(ATTENDANTS_VERSION, _load_attendants)
+
+
+def attendant_names():
+    """{id: name} of every CSA, cached in this process until it changes."""
+    return _attendants.get()
+
+
+def attendant_choices():
+    """Choices for the csa_name dropdowns, led by the empty option."""
+    return [("0", "--Select CSA Name--")] + [
+        (str(attendant_id), name) for attendant_id, name in attendant_names().items()
+    ]
+
+
+def attendant_name(attendant_id):
+    """Name for a submitted csa_name value, "" when none was picked."""
+    return attendant_names().get(int(attendant_id), "")
+
+
+def attendants_changed():
+    """Call before committing any change to csanames."""
+    bump_version(ATTENDANTS_VERSION)
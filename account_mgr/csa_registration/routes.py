@@ -1,5 +1,6 @@
 from account_mgr import db
 from .form import AttendantForm
+from .attendants import attendants_changed
 from flask_login import login_required
 from account_mgr.database.models import CSAName
 from flask import render_template, url_for, flash, redirect, Blueprint
@@ -32,6 +33,7 @@ def add_attendant():
         else:
             new_attendant = CSAName(attendant_name=new_name)
             db.session.add(new_attendant)
+            attendants_changed()
             db.session.commit()
             flash(message="Attendant added successfully", category="success")
             return redirect(url_for(endpoint="attendants_registration.add_attendant"))
@@ -64,6 +66,7 @@ def update_attendant(attendant_id):
         else:
             attendant.attendant_name = new_name
             try:
+                attendants_changed()
                 db.session.commit()
                 flash(message="Attendant updated successfully", category="success")
                 return redirect(
@@ -84,6 +87,7 @@ def delete_attendant(attendant_id):
     attendant = CSAName.query.get_or_404(attendant_id)
     try:
         db.session.delete(attendant)
+        attendants_changed()
         db.session.commit()
         flash(message="Attendant deleted successfully", category="success")
     except Exception as e:
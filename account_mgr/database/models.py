@@ -4,14 +4,46 @@ from sqlalchemy.sql import func
 from flask_login import UserMixin
 from sqlalchemy.orm import validates
 from decimal import Decimal, ROUND_HALF_UP
-from account_mgr import db, login_manager, app
+from account_mgr import db, login_manager, app, cache
 from itsdangerous import URLSafeTimedSerializer
 
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user from the database using the user ID."""
-    return User.query.get(int(user_id))
+    """
+    Load the user through a short-TTL cache, kept per worker and checked
+    against the user's cache_versions counter, so a change made through
+    any worker is seen by all of them on their next request. A cached copy
+    is merged back into the session with load=False, without a SELECT.
+    """
+    from account_mgr.database.versions import current_version
+
+    key = user_cache_key(user_id)
+    version = current_version(key)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        return db.session.merge(cached[1], load=False)
+
+    user = User.query.get(int(user_id))
+    if user is not None:
+        cache.set(key, (version, user), timeout=app.config["USER_CACHE_TIMEOUT"])
+    return user
+
+
+def user_cache_key(user_id):
+    return f"user:{user_id}"
+
+
+def user_image_cache_key(picture):
+    # Keyed by the picture itself: a new picture is a new key
+    return f"user_image:{picture}"
+
+
+def invalidate_user(user_id):
+    """Call before committing any change to a user's row."""
+    from account_mgr.database.versions import bump_version
+
+    bump_version(user_cache_key(user_id))
 
 
 class Tenant(db.Model):
@@ -80,6 +112,13 @@ class ClosingSession(db.Model):
 
     __tablename__ = "closing_sessions"
 
+    __table_args__ = (
+        db.Index(
+            "ix_closing_sessions_section_session_date", "section", "session_date"
+        ),
+        db.Index("ix_closing_sessions_date_created_id", "date_created", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     section = db.Column(db.String(100), nullable=False)
     admin_user_name = db.Column(db.String(100), nullable=True)
@@ -118,6 +157,12 @@ class MeterReading(db.Model):
 
     __tablename__ = "meter_readings"
 
+    __table_args__ = (
+        db.Index("ix_meter_readings_session_id", "session_id"),
+        db.Index("ix_meter_readings_date_of_sale_id", "date_of_sale", "id"),
+        db.Index("ix_meter_readings_date_created", "date_created"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(
         db.Integer, db.ForeignKey("closing_sessions.id"), nullable=False
@@ -148,6 +193,12 @@ class D14Reading(db.Model):
 
     __tablename__ = "d14_readings"
 
+    __table_args__ = (
+        db.Index("ix_d14_readings_session_id", "session_id"),
+        db.Index("ix_d14_readings_date_of_sale_id", "date_of_sale", "id"),
+        db.Index("ix_d14_readings_date_created", "date_created"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     session_id = db.Column(
@@ -178,6 +229,19 @@ class D14Reading(db.Model):
         return f"<D14Reading {self.section} - {self.liters_sold}L>"
 
 
+# Opening-meter lookups match on lower(section) and the sale date
+db.Index(
+    "ix_meter_readings_lower_section_date_of_sale",
+    func.lower(MeterReading.section),
+    MeterReading.date_of_sale,
+)
+db.Index(
+    "ix_d14_readings_lower_section_date_of_sale",
+    func.lower(D14Reading.section),
+    D14Reading.date_of_sale,
+)
+
+
 # ---------------- CREDIT / E-TRANSACTIONS ----------------
 class CreditTransaction(db.Model):
     """Model for storing credit transactions."""
@@ -186,6 +250,7 @@ class CreditTransaction(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("session_id", name="unique_credit_per_session"),
+        db.Index("ix_credit_transactions_date_created", "date_created"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -256,6 +321,7 @@ class PaperTransaction(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("session_id", name="unique_paper_per_session"),
+        db.Index("ix_paper_transactions_date_created", "date_created"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -286,6 +352,7 @@ class CoinsTransaction(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("session_id", name="unique_coins_per_session"),
+        db.Index("ix_coins_transactions_date_created", "date_created"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -301,6 +368,54 @@ class CoinsTransaction(db.Model):
     is_reconciliation = db.Column(db.Boolean, default=False)
 
 
+class DailyClosingSummary(db.Model):
+    """Per-day, per-section rollup of closing figures, refreshed on every write."""
+
+    __tablename__ = "daily_closing_summaries"
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "session_date", "section", name="unique_summary_per_day_section"
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_date = db.Column(db.Date, nullable=False, index=True)
+    section = db.Column(db.String(100), nullable=False)
+
+    # Meter readings (super + diesel)
+    liters_sold = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    meter_total = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    # Credit transactions
+    total_credit = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    total_collection = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    cash_to_bank = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+
+    # Denomination counts (pieces)
+    note_200 = db.Column(db.Integer, nullable=False, default=0)
+    note_100 = db.Column(db.Integer, nullable=False, default=0)
+    note_50 = db.Column(db.Integer, nullable=False, default=0)
+    note_20 = db.Column(db.Integer, nullable=False, default=0)
+    note_10 = db.Column(db.Integer, nullable=False, default=0)
+    note_5 = db.Column(db.Integer, nullable=False, default=0)
+    note_2 = db.Column(db.Integer, nullable=False, default=0)
+    note_1 = db.Column(db.Integer, nullable=False, default=0)
+    coin_5 = db.Column(db.Integer, nullable=False, default=0)
+    coin_2 = db.Column(db.Integer, nullable=False, default=0)
+    coin_1 = db.Column(db.Integer, nullable=False, default=0)
+
+    date_updated = db.Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<DailyClosingSummary {self.section} - {self.session_date}>"
+
+
 class CSAName(db.Model):
     """Model for storing CSA names (master list of attendants)"""
 
@@ -313,6 +428,18 @@ class CSAName(db.Model):
         return f"<CSAName {self.attendant_name}>"
 
 
+class CacheVersion(db.Model):
+    """Version counter per dataset that worker processes keep cached in memory"""
+
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(length=50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CacheVersion {self.name}={self.version}>"
+
+
 class DailyReport(db.Model):
     __tablename__ = "daily_reports"
 
@@ -0,0 +1,155 @@
+from datetime import date, datetime
+from functools import cached_property
+from sqlalchemy import func, select, text, tuple_
+from itsdangerous import BadSignature, URLSafeSerializer
+from account_mgr import app, db, cache
+from account_mgr.database.models import D14Reading, MeterReading, ClosingSession
+
+
+# Newest-first listing keys per model. The trailing id makes the order
+# total, so every row sits on exactly one page; each tuple is backed by a
+# composite index.
+LISTING_KEYS = {
+    MeterReading: (MeterReading.date_of_sale, MeterReading.id),
+    D14Reading: (D14Reading.date_of_sale, D14Reading.id),
+    ClosingSession: (ClosingSession.date_created, ClosingSession.id),
+}
+
+
+# ---------- CURSORS ----------
+def _cursor_serializer():
+    return URLSafeSerializer(app.config["SECRET_KEY"], salt="keyset-cursor")
+
+
+def _dump_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _load_value(column, value):
+    python_type = column.type.python_type
+    if python_type in (date, datetime):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(keys, row, direction):
+    """Opaque, signed token for the position of `row` in a listing."""
+    values = [_dump_value(getattr(row, column.key)) for column in keys]
+    return _cursor_serializer().dumps([direction, values])
+
+
+def decode_cursor(keys, token):
+    """Return (direction, key values), or (None, None) for a bad token."""
+    try:
+        direction, values = _cursor_serializer().loads(token)
+        if direction not in ("next", "prev") or len(values) != len(keys):
+            return None, None
+        return direction, [_load_value(c, v) for c, v in zip(keys, values)]
+    except (BadSignature, TypeError, ValueError):
+        return None, None
+
+
+# ---------- COUNTS ----------
+def _estimated_rows(model):
+    """Planner row estimate on PostgreSQL; None where there is none."""
+    if db.engine.dialect.name != "postgresql":
+        return None
+    estimate = db.session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": model.__tablename__},
+    ).scalar()
+    return estimate if estimate and estimate > 0 else None
+
+
+def approximate_count(model):
+    """
+    Row count of `model`'s table, cached for LISTING_COUNT_TIMEOUT. Tables
+    the planner estimates above LISTING_ESTIMATE_THRESHOLD rows use that
+    estimate instead of a COUNT(*).
+    """
+    key = f"listing_count:{model.__tablename__}"
+    total = cache.get(key)
+    if total is None:
+        total = _estimated_rows(model)
+        if total is None or total < app.config["LISTING_ESTIMATE_THRESHOLD"]:
+            total = db.session.execute(
+                select(func.count()).select_from(model)
+            ).scalar()
+        cache.set(key, total, timeout=app.config["LISTING_COUNT_TIMEOUT"])
+    return total
+
+
+# ---------- PAGES ----------
+class KeysetPage:
+    """
+    One page of a newest-first keyset listing. Nothing is queried until
+    the page is read, and each page is a single index range scan of
+    per_page + 1 rows, so deep pages cost the same as the first one.
+    """
+
+    def __init__(self, model, keys, cursor=None, per_page=20):
+        self.model = model
+        self.keys = keys
+        self.per_page = per_page
+        self.direction, self.position = (
+            decode_cursor(keys, cursor) if cursor else (None, None)
+        )
+
+    @cached_property
+    def _rows(self):
+        query = self.model.query
+        if self.direction == "prev":
+            query = query.filter(tuple_(*self.keys) > tuple(self.position))
+            query = query.order_by(*[column.asc() for column in self.keys])
+        else:
+            if self.direction == "next":
+                query = query.filter(tuple_(*self.keys) < tuple(self.position))
+            query = query.order_by(*[column.desc() for column in self.keys])
+
+        rows = query.limit(self.per_page + 1).all()
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if self.direction == "prev":
+            rows.reverse()
+        return rows, more
+
+    @property
+    def items(self):
+        return self._rows[0]
+
+    @property
+    def has_next(self):
+        # Paging back always leaves rows after this page
+        return self.direction == "prev" or self._rows[1]
+
+    @property
+    def has_prev(self):
+        if self.direction == "prev":
+            return self._rows[1]
+        return self.direction == "next"
+
+    @property
+    def next_cursor(self):
+        if self.has_next and self.items:
+            return encode_cursor(self.keys, self.items[-1], "next")
+        return None
+
+    @property
+    def prev_cursor(self):
+        if self.has_prev and self.items:
+            return encode_cursor(self.keys, self.items[0], "prev")
+        return None
+
+    @cached_property
+    def total(self):
+        return approximate_count(self.model)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+def listing_page(model, cursor=None, per_page=20):
+    """Keyset page of `model` ordered by its LISTING_KEYS, newest first."""
+    return KeysetPage(model, LISTING_KEYS[model], cursor=cursor, per_page=per_page)
@@ -0,0 +1,160 @@
+import os
+import time
+import logging
+import threading
+import itertools
+from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from flask import has_request_context, request
+from account_mgr import app, db
+
+
+logger = logging.getLogger(__name__)
+
+# EXPLAIN prefix per dialect; others are logged without a plan
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE off) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+# Parameter names whose values never reach the log
+REDACTED_PARAMS = ("password", "pin", "token", "secret")
+
+SQL_LOG_LIMIT = 4000
+PARAMS_LOG_LIMIT = 500
+
+_records = deque(maxlen=app.config["SLOW_QUERY_LOG_SIZE"])
+_ids = itertools.count(1)
+_explainer = None
+_explainer_lock = threading.Lock()
+
+
+# ---------- RECORDS ----------
+def slow_queries():
+    """This process's slow-query records, newest first."""
+    return list(reversed(_records))
+
+
+def _secret(name):
+    return any(word in name.lower() for word in REDACTED_PARAMS)
+
+
+def _redact(parameters, context):
+    if isinstance(parameters, dict):
+        parameters = {
+            key: "***" if _secret(key) else value for key, value in parameters.items()
+        }
+    elif isinstance(parameters, (tuple, list)):
+        # Positional (SQLite) parameters are named by the compiled statement
+        names = getattr(getattr(context, "compiled", None), "positiontup", None)
+        if names and len(names) == len(parameters):
+            parameters = tuple(
+                "***" if _secret(name) else value
+                for name, value in zip(names, parameters)
+            )
+    text = repr(parameters)
+    return text if len(text) <= PARAMS_LOG_LIMIT else text[:PARAMS_LOG_LIMIT] + "…"
+
+
+def _caller():
+    """(endpoint, blueprint) of the request running the statement."""
+    if has_request_context():
+        return request.endpoint or "NO_ENDPOINT", request.blueprint or ""
+    return f"thread:{threading.current_thread().name}", ""
+
+
+# ---------- EXPLAIN ----------
+def _get_explainer():
+    global _explainer
+    with _explainer_lock:
+        if _explainer is None:
+            # One thread: plans are captured one at a time, off the request
+            _explainer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="slow-query-explain"
+            )
+        return _explainer
+
+
+def _forget_explainer():
+    global _explainer
+    _explainer = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_explainer)
+
+
+def _explain(engine, record, statement, parameters):
+    """Plan `statement` on a connection of its own; EXPLAIN never runs it."""
+    prefix = EXPLAIN_PREFIXES[engine.dialect.name]
+    try:
+        with engine.connect().execution_options(slow_query_log=False) as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    except Exception as e:
+        record["plan"] = f"EXPLAIN failed: {e}"
+        return
+    if engine.dialect.name == "sqlite":
+        # (id, parent, notused, detail)
+        record["plan"] = "\n".join(row[-1] for row in rows)
+    else:
+        record["plan"] = "\n".join(row[0] for row in rows)
+    logger.warning("Plan for slow query #%d:\n%s", record["id"], record["plan"])
+
+
+# ---------- ENGINE EVENTS ----------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info["slow_query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    start = conn.info.pop("slow_query_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    if elapsed * 1000 < app.config["SLOW_QUERY_THRESHOLD_MS"]:
+        return
+    if not conn.get_execution_options().get("slow_query_log", True):
+        return
+
+    endpoint, blueprint = _caller()
+    record = {
+        "id": next(_ids),
+        "at": datetime.now(timezone.utc),
+        "ms": round(elapsed * 1000, 1),
+        "sql": statement[:SQL_LOG_LIMIT],
+        "params": _redact(parameters, context),
+        "endpoint": endpoint,
+        "blueprint": blueprint,
+        "pid": os.getpid(),
+        "plan": None,
+    }
+    _records.append(record)
+    logger.warning(
+        "Slow query #%d (%.0fms) in %s: %s | params=%s",
+        record["id"],
+        record["ms"],
+        endpoint,
+        record["sql"],
+        record["params"],
+    )
+
+    explainable = statement.lstrip().upper().startswith(EXPLAINABLE)
+    if (
+        app.config["SLOW_QUERY_EXPLAIN"]
+        and not many
+        and explainable
+        and conn.engine.dialect.name in EXPLAIN_PREFIXES
+    ):
+        _get_explainer().submit(_explain, conn.engine, record, statement, parameters)
+
+
+def setup_slow_query_log():
+    """Watch every statement on the app's engine; SLOW_QUERY_THRESHOLD_MS=0 is off."""
+    if not app.config["SLOW_QUERY_THRESHOLD_MS"]:
+        return
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(db.engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,135 @@
+import os
+import click
+import logging
+import tempfile
+from contextlib import contextmanager
+from sqlalchemy import inspect, text
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from account_mgr import app, db
+
+try:
+    import fcntl
+except ImportError:  # Windows dev servers run a single process
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(app.root_path), "migrations")
+
+_heads = None
+
+
+# ---------- REVISIONS ----------
+def _alembic_config():
+    config = Config(os.path.join(MIGRATIONS_DIR, "alembic.ini"))
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    return config
+
+
+def head_revisions():
+    """Alembic heads of the migrations shipped with this build."""
+    global _heads
+    if _heads is None:
+        _heads = set(ScriptDirectory.from_config(_alembic_config()).get_heads())
+    return _heads
+
+
+def current_revisions(connection):
+    if not inspect(connection).has_table("alembic_version"):
+        return set()
+    rows = connection.execute(text("SELECT version_num FROM alembic_version"))
+    return set(rows.scalars())
+
+
+def schema_is_current():
+    """Cheap check: is the database already stamped at head?"""
+    with db.engine.connect() as connection:
+        return current_revisions(connection) == head_revisions()
+
+
+def upgrade_to_head(connection):
+    """Run pending migrations in-process, on `connection`."""
+    config = _alembic_config()
+    # Read by migrations/env.py: reuse this connection, keep the app's logging
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "heads")
+
+
+# ---------- LOCK ----------
+@contextmanager
+def init_lock():
+    """
+    Held by the one process initialising the database. PostgreSQL uses a
+    session advisory lock, so it covers every worker on every host; other
+    databases fall back to a file lock for the workers on this host.
+    """
+    if db.engine.dialect.name == "postgresql":
+        key = app.config["DB_INIT_LOCK_KEY"]
+        with db.engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+            try:
+                yield
+            finally:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": key}
+                )
+        return
+
+    path = os.path.join(tempfile.gettempdir(), "account_mgr-db-init.lock")
+    with open(path, "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# ---------- STARTUP ----------
+def prepare_database():
+    """
+    Create, migrate and seed the database once per deployment. Workers
+    that find the schema stamped at head return after one version check;
+    the rest queue on the init lock, and only the first of them does the
+    work while the others find it done when they get the lock.
+
+    Tables still come from db.create_all(), so a new model needs a
+    migration too, or existing databases never get its table.
+    """
+    from account_mgr.super_admin.routes import seed_super_admin
+    from account_mgr.database.summary import backfill_daily_summaries
+
+    if schema_is_current():
+        logger.debug("Database schema is current; skipping initialisation")
+        return False
+
+    with init_lock():
+        if schema_is_current():
+            return False
+
+        db.create_all()
+        # Raises if the admin cannot be created (e.g. ADMIN_PASSWORD unset)
+        seed_super_admin()
+        backfill_daily_summaries()
+        # Stamping head comes last, so a failed start is retried next boot
+        with db.engine.begin() as connection:
+            upgrade_to_head(connection)
+
+    logger.info("Database initialised at %s", ", ".join(sorted(head_revisions())))
+    return True
+
+
+@app.cli.command("init-db")
+def init_db_command():
+    """Create, migrate and seed the database if it is not at head."""
+    if prepare_database():
+        click.echo("Database initialised.")
+    else:
+        click.echo("Database schema is already current.")
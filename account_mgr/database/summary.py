@@ -0,0 +1,208 @@
+import click
+from sqlalchemy import func
+from account_mgr import app, db
+from account_mgr.database.versions import UPSERTS
+from account_mgr.database.models import (
+    D14Reading,
+    MeterReading,
+    ClosingSession,
+    CoinsTransaction,
+    PaperTransaction,
+    CreditTransaction,
+    DailyClosingSummary,
+)
+
+
+# Denominations submitted through the adjustment form are stored on
+# closing sessions with this section instead of a pump section.
+RECONCILIATION_SECTION = "RECONCILIATION"
+DIESEL_SECTION = "D1D4"
+
+# Denomination column -> face value in cedis
+PAPER_DENOMINATIONS = {
+    "note_200": 200,
+    "note_100": 100,
+    "note_50": 50,
+    "note_20": 20,
+    "note_10": 10,
+    "note_5": 5,
+    "note_2": 2,
+    "note_1": 1,
+}
+COIN_DENOMINATIONS = {"coin_5": 0.5, "coin_2": 2, "coin_1": 1}
+
+# Source model -> {summary column: source column}
+SUMMARY_SOURCES = {
+    MeterReading: {"liters_sold": "liters_sold", "meter_total": "total"},
+    D14Reading: {"liters_sold": "liters_sold", "meter_total": "total"},
+    CreditTransaction: {
+        "total_credit": "total_credit",
+        "total_collection": "total_collection",
+        "cash_to_bank": "cash_to_bank",
+    },
+    PaperTransaction: {col: col for col in PAPER_DENOMINATIONS},
+    CoinsTransaction: {col: col for col in COIN_DENOMINATIONS},
+}
+
+SUMMARY_FIELDS = [
+    "liters_sold",
+    "meter_total",
+    "total_credit",
+    "total_collection",
+    "cash_to_bank",
+    *PAPER_DENOMINATIONS,
+    *COIN_DENOMINATIONS,
+]
+
+
+def aggregate_closing_totals(*filters):
+    """
+    Sum the raw closing tables per (session_date, section), one grouped
+    query per source model. `filters` apply to ClosingSession.
+    """
+    totals = {}
+    for model, columns in SUMMARY_SOURCES.items():
+        rows = (
+            db.session.query(
+                ClosingSession.session_date,
+                ClosingSession.section,
+                *[
+                    func.coalesce(func.sum(getattr(model, source)), 0)
+                    for source in columns.values()
+                ],
+            )
+            .join(model, model.session_id == ClosingSession.id)
+            .filter(*filters)
+            .group_by(ClosingSession.session_date, ClosingSession.section)
+            .all()
+        )
+        for session_date, section, *sums in rows:
+            bucket = totals.setdefault(
+                (session_date, section), dict.fromkeys(SUMMARY_FIELDS, 0)
+            )
+            for field, value in zip(columns, sums):
+                bucket[field] += value
+    return totals
+
+
+def _claim_summary(session_date, section):
+    """
+    Make sure the rollup row exists and lock it for this transaction, so
+    refreshes of one day and section run one after another. The insert
+    waits on a concurrent one for the same key instead of failing on
+    the unique constraint.
+    """
+    insert = UPSERTS.get(db.session.get_bind().dialect.name)
+    if insert is not None:
+        db.session.execute(
+            insert(DailyClosingSummary)
+            .values(session_date=session_date, section=section)
+            .on_conflict_do_nothing(index_elements=["session_date", "section"])
+        )
+    return (
+        DailyClosingSummary.query.filter_by(session_date=session_date, section=section)
+        .populate_existing()
+        .with_for_update()
+        .first()
+    )
+
+
+def refresh_daily_summary(session_date, section):
+    """
+    Recompute the rollup row for one day and section from the raw tables.
+    Call it before committing any write to a closing session so the rollup
+    changes in the same transaction. The row stays locked until then, and
+    the totals are read after taking the lock, so concurrent saves never
+    overwrite each other with stale sums.
+    """
+    summary = _claim_summary(session_date, section)
+
+    has_session = (
+        db.session.query(ClosingSession.id)
+        .filter_by(session_date=session_date, section=section)
+        .first()
+    )
+    if not has_session:
+        if summary:
+            db.session.delete(summary)
+        return None
+
+    totals = aggregate_closing_totals(
+        ClosingSession.session_date == session_date,
+        ClosingSession.section == section,
+    ).get((session_date, section), dict.fromkeys(SUMMARY_FIELDS, 0))
+
+    if not summary:
+        summary = DailyClosingSummary(session_date=session_date, section=section)
+        db.session.add(summary)
+
+    for field, value in totals.items():
+        setattr(summary, field, value)
+    return summary
+
+
+def rebuild_daily_summaries():
+    """Drop and rebuild every rollup row from the raw closing tables."""
+    totals = aggregate_closing_totals()
+    keys = db.session.query(ClosingSession.session_date, ClosingSession.section)
+
+    DailyClosingSummary.query.delete()
+    summaries = [
+        DailyClosingSummary(
+            session_date=session_date,
+            section=section,
+            **totals.get((session_date, section), dict.fromkeys(SUMMARY_FIELDS, 0)),
+        )
+        for session_date, section in keys.distinct().all()
+    ]
+    db.session.add_all(summaries)
+    db.session.commit()
+    return len(summaries)
+
+
+def backfill_daily_summaries():
+    """Build the rollup once when it is empty but closing history exists."""
+    if DailyClosingSummary.query.first() or not ClosingSession.query.first():
+        return 0
+    return rebuild_daily_summaries()
+
+
+def summary_range_totals(start_date, end_date):
+    """
+    Sum the rollup between two session dates, one entry per section. Each
+    entry also carries the number of rollup rows it was built from.
+    """
+    rows = (
+        db.session.query(
+            DailyClosingSummary.section,
+            func.count(DailyClosingSummary.id),
+            *[
+                func.coalesce(func.sum(getattr(DailyClosingSummary, field)), 0)
+                for field in SUMMARY_FIELDS
+            ],
+        )
+        .filter(DailyClosingSummary.session_date.between(start_date, end_date))
+        .group_by(DailyClosingSummary.section)
+        .all()
+    )
+    return {
+        section: {"summaries": count, **dict(zip(SUMMARY_FIELDS, sums))}
+        for section, count, *sums in rows
+    }
+
+
+def combine_sections(totals, include):
+    """Add up the per-section totals whose section passes `include`."""
+    combined = dict.fromkeys(["summaries", *SUMMARY_FIELDS], 0)
+    for section, values in totals.items():
+        if include(section):
+            for field, value in values.items():
+                combined[field] += value
+    return combined
+
+
+@app.cli.command("rebuild-daily-summaries")
+def rebuild_daily_summaries_command():
+    """Backfill daily_closing_summaries from the closing history."""
+    count = rebuild_daily_summaries()
+    click.echo(f"Rebuilt {count} daily closing summaries.")
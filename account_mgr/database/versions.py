@@ -0,0 +1,71 @@
+import threading
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from account_mgr import db
+from account_mgr.database.models import CacheVersion
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def current_version(name):
+    """Committed version of `name`; 0 until it is first bumped."""
+    version = db.session.execute(
+        select(CacheVersion.version).where(CacheVersion.name == name)
+    ).scalar()
+    return version or 0
+
+
+def bump_version(name):
+    """
+    Move `name` to a new version in the current transaction, so every
+    worker reloads its copy once the change commits (and not before).
+    One upsert, so two workers bumping a new name at once both succeed.
+    """
+    insert = UPSERTS.get(db.session.get_bind().dialect.name)
+    if insert is not None:
+        db.session.execute(
+            insert(CacheVersion)
+            .values(name=name, version=1)
+            .on_conflict_do_update(
+                index_elements=[CacheVersion.name],
+                set_={"version": CacheVersion.version + 1},
+            )
+        )
+        return
+
+    bumped = db.session.execute(
+        update(CacheVersion)
+        .where(CacheVersion.name == name)
+        .values(version=CacheVersion.version + 1)
+    ).rowcount
+    if not bumped:
+        db.session.add(CacheVersion(name=name, version=1))
+
+
+class VersionedCache:
+    """
+    A value built by `load` and kept in this process until the version
+    counter `name` moves. Each read costs one primary-key lookup on
+    cache_versions instead of re-running `load`.
+    """
+
+    def __init__(self, name, load):
+        self.name = name
+        self.load = load
+        self._lock = threading.Lock()
+        self._version = None
+        self._value = None
+
+    def get(self):
+        # Read the version first: a change committed while loading only
+        # makes the next read reload again, never keeps stale data
+        version = current_version(self.name)
+        with self._lock:
+            if self._version == version:
+                return self._value
+        value = self.load()
+        with self._lock:
+            self._version, self._value = version, value
+        return value
@@ -0,0 +1,106 @@
+import secrets
+from flask import g
+from werkzeug.datastructures import Headers
+
+
+CSP_HEADER = "Content-Security-Policy"
+
+# Directives that get the per-request nonce when CSP_NONCE is on
+NONCE_DIRECTIVES = ("script-src", "style-src")
+
+# Marker the compiled policy is split on, never sent to clients
+_NONCE_MARK = "\0"
+
+
+def build_csp(directives, nonce=False):
+    """Join {directive: [sources]} into a policy string."""
+    parts = []
+    for name, sources in directives.items():
+        if nonce and name in NONCE_DIRECTIVES:
+            sources = [*sources, f"'nonce-{_NONCE_MARK}'"]
+        parts.append(" ".join([name, *sources]))
+    return "; ".join(parts)
+
+
+def build_permissions_policy(features):
+    """Join {feature: allowlist} into a Permissions-Policy string."""
+    return ", ".join(f"{feature}=({allow})" for feature, allow in features.items())
+
+
+def csp_nonce():
+    """Per-request CSP nonce, generated the first time a template asks for it."""
+    if "csp_nonce" not in g:
+        g.csp_nonce = secrets.token_urlsafe(16)
+    return g.csp_nonce
+
+
+class HeaderSet:
+    """
+    A security header block compiled once at startup. With nonce mode the
+    CSP is kept as a template with a marker where the nonce goes, so a
+    response only pays for one replace, and only when the page used a nonce.
+    """
+
+    __slots__ = ("headers", "items", "keys", "nonce_csp", "nonce_items")
+
+    def __init__(self, headers, csp_directives=None, nonce=False):
+        # Building a Headers object validates every value once, here
+        self.headers = Headers()
+        self.nonce_csp = None
+        if csp_directives:
+            self.headers[CSP_HEADER] = build_csp(csp_directives)
+            if nonce:
+                self.nonce_csp = build_csp(csp_directives, nonce=True)
+        for key, value in headers.items():
+            if value is not None:
+                self.headers[key] = value
+        self.items = list(self.headers.items())
+        self.keys = {key.lower() for key, _ in self.items}
+        self.nonce_items = [item for item in self.items if item[0] != CSP_HEADER]
+
+    def apply(self, response):
+        items = self.items
+        if self.nonce_csp and "csp_nonce" in g:
+            # token_urlsafe output is header-safe, no need to revalidate
+            csp = self.nonce_csp.replace(_NONCE_MARK, g.csp_nonce)
+            items = [*self.nonce_items, (CSP_HEADER, csp)]
+
+        headers = response.headers
+        if self.keys.isdisjoint(key.lower() for key in headers.keys()):
+            # Common case: append the prevalidated pairs in one go
+            headers.extend(items)
+        else:
+            # A view set one of these itself; replace as before
+            for key, value in items:
+                headers[key] = value
+        return response
+
+
+def compile_security_headers(config):
+    """
+    Build the default HeaderSet plus one per blueprint listed in
+    SECURITY_HEADERS_OVERRIDES. An override maps header -> value, where
+    None drops the header and a dict under Content-Security-Policy is
+    merged into the default CSP directives.
+
+    Returns (default, {blueprint name: HeaderSet}, static HeaderSet).
+    """
+    base_headers = {
+        **config["SECURITY_HEADERS"],
+        "Permissions-Policy": build_permissions_policy(config["PERMISSIONS_POLICY"]),
+    }
+    base_csp = config["CSP_DIRECTIVES"]
+    nonce = config.get("CSP_NONCE", False)
+
+    default = HeaderSet(base_headers, base_csp, nonce)
+
+    per_blueprint = {}
+    for blueprint, overrides in config.get("SECURITY_HEADERS_OVERRIDES", {}).items():
+        overrides = dict(overrides)
+        csp = overrides.pop(CSP_HEADER, {})
+        if csp is not None:
+            csp = {**base_csp, **csp}
+        per_blueprint[blueprint] = HeaderSet({**base_headers, **overrides}, csp, nonce)
+
+    static = HeaderSet(config.get("STATIC_SECURITY_HEADERS", {}))
+    return default, per_blueprint, static
@@ -0,0 +1,92 @@
+import os
+import re
+import sys
+import click
+import importlib
+import subprocess
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that is imported the first time one of its
+    attributes is used, so workers only pay for it on the code paths that
+    need it (exports, image uploads) instead of at startup.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._module or self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+# Heavy dependencies, imported on first use. Import them from here rather
+# than at the top of a module that `account_mgr` loads at startup.
+pd = LazyModule("pandas")
+xlsxwriter = LazyModule("xlsxwriter")
+Image = LazyModule("PIL.Image")
+ImageOps = LazyModule("PIL.ImageOps")
+num2words = LazyModule("num2words")
+
+LAZY_MODULES = ("pandas", "xlsxwriter", "PIL", "num2words", "pyarrow")
+
+
+# ---------- IMPORT BUDGET ----------
+def measure_import(module, cwd=None):
+    """
+    Import `module` in a fresh interpreter under `-X importtime`. Returns
+    its cumulative import time in ms and the lazy modules it pulled in.
+    """
+    probe = (
+        f"import sys, {module}; "
+        f"print('lazy:', *[m for m in {LAZY_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+    if result.returncode:
+        error = result.stderr[-2000:]
+        raise click.ClickException(f"Could not import {module}:\n{error}")
+    # "import time: self [us] | cumulative | imported package"
+    pattern = re.compile(rf"^import time:\s*\d+ \|\s*(\d+) \| {re.escape(module)}$")
+    micros = [
+        int(match.group(1))
+        for line in result.stderr.splitlines()
+        if (match := pattern.match(line))
+    ]
+    # The app may log to stdout too; the probe's line comes last
+    probe = [line for line in result.stdout.splitlines() if line.startswith("lazy:")]
+    loaded = probe[-1].split()[1:] if probe else []
+    return (micros[-1] / 1000 if micros else 0.0), loaded
+
+
+def setup_import_budget(app):
+    @app.cli.command("import-budget")
+    def import_budget_command():
+        """Fail if importing account_mgr got slower or loads a lazy module."""
+        budget = app.config["IMPORT_TIME_BUDGET_MS"]
+        project_root = os.path.dirname(app.root_path)
+        elapsed, loaded = measure_import("account_mgr", cwd=project_root)
+        click.echo(f"account_mgr imported in {elapsed:.0f}ms (budget {budget}ms)")
+        if loaded:
+            raise click.ClickException(
+                f"Loaded at import time: {', '.join(loaded)}; use account_mgr.lazy_"
+            )
+        if elapsed > budget:
+            raise click.ClickException("Import time is over budget")
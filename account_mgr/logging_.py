@@ -0,0 +1,90 @@
+import os
+import sys
+import queue
+import atexit
+import logging
+from functools import partial
+from flask.logging import default_handler
+from .ansi_ import get_color_support, NO_COLOR
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Logger used by the before/after request hooks
+request_logger = logging.getLogger("account_mgr.requests")
+
+LEVEL_COLORS = {
+    logging.DEBUG: "GREEN",
+    logging.INFO: "GREEN",
+    logging.WARNING: "YELLOW",
+    logging.ERROR: "RED",
+    logging.CRITICAL: "RED",
+}
+
+
+class ColorFormatter(logging.Formatter):
+    """Formatter that wraps each line in an ANSI colour picked by level."""
+
+    def __init__(self, fmt, colors):
+        super().__init__(fmt)
+        self.colors = colors
+
+    def format(self, record):
+        message = super().format(record)
+        color = self.colors[LEVEL_COLORS.get(record.levelno, "GREEN")]
+        if not color:
+            return message
+        return f"{color}{message}{self.colors['RESET']}"
+
+
+# The running QueueListener; replaced by a fresh one in a forked child
+_listener = None
+
+
+def _start_listener(log_queue, handler):
+    global _listener
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def setup_logging(app):
+    """
+    Send every log record through a queue drained by a background
+    QueueListener, so request threads never block on stdout. Levels come
+    from LOG_LEVEL and LOG_LEVELS in the active config.
+    """
+    stream = sys.stdout
+    colors = get_color_support() if stream.isatty() else NO_COLOR
+
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(
+        ColorFormatter(fmt=app.config["LOG_FORMAT"], colors=colors)
+    )
+
+    log_queue = queue.SimpleQueue()
+
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(app.config["LOG_LEVEL"])
+
+    # Flask's own stderr handler would bypass the queue
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(app.config["LOG_LEVEL"])
+
+    for name, level in app.config["LOG_LEVELS"].items():
+        logging.getLogger(name).setLevel(level)
+
+    listener = _start_listener(log_queue, handler)
+    atexit.register(_stop_listener)
+
+    # The listener thread does not survive a fork (gunicorn --preload); the
+    # child drains the same queue with a listener of its own
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=partial(_start_listener, log_queue, handler))
+
+    return listener
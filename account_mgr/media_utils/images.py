@@ -0,0 +1,118 @@
+import io
+import os
+import hashlib
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from image_worker import variant_name, render_variants
+from account_mgr.lazy_ import Image
+
+
+logger = logging.getLogger(__name__)
+
+# Pillow format -> stored extension; anything else is stored as PNG
+IMAGE_FORMATS = {"JPEG": ".jpg", "PNG": ".png"}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# ---------- NAMING ----------
+def all_variants(filename, sizes):
+    for size in (None, *sizes):
+        yield variant_name(filename, size)
+        yield variant_name(filename, size, webp=True)
+
+
+# ---------- POOL ----------
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: a forked child would inherit the engine's
+            # sockets and rerun every at-fork hook (session purge, logging).
+            # Workers only import image_worker, which never loads the app.
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _forget_pool():
+    global _pool
+    _pool = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pool)
+
+
+def _log_failure(future):
+    if future.exception() is not None:
+        logger.error("Image processing failed", exc_info=future.exception())
+
+
+# ---------- PIPELINE ----------
+def store_image(upload, directory, max_size, sizes, workers):
+    """
+    Store an uploaded image under a content-hash name and return that name.
+
+    The upload is checked and written right away, so the returned name is
+    usable immediately: JPEG/PNG as-is, other formats converted to PNG in
+    the request. The resized JPEG/PNG and WebP variants are rendered in
+    the process pool and replace it when done. Identical uploads share one
+    set of files and are only processed once.
+    """
+    data = upload.read()
+    with Image.open(io.BytesIO(data)) as image:
+        # Other formats are only stored once converted to PNG
+        native = image.format in IMAGE_FORMATS
+        ext = IMAGE_FORMATS.get(image.format, ".png")
+        # Cheap structural check so a broken upload fails in the request
+        image.verify()
+
+    filename = hashlib.sha256(data).hexdigest()[:16] + ext
+    os.makedirs(directory, exist_ok=True)
+    if all(
+        os.path.exists(os.path.join(directory, name))
+        for name in all_variants(filename, sizes)
+    ):
+        return filename
+
+    original = os.path.join(directory, filename)
+    if not os.path.exists(original):
+        if native:
+            with open(f"{original}.tmp", "wb") as f:
+                f.write(data)
+            os.replace(f"{original}.tmp", original)
+        else:
+            # Rare (GIF, BMP, WebP...): render the full-size PNG now
+            render_variants(data, directory, filename, max_size, {})
+
+    future = _get_pool(workers).submit(
+        render_variants, data, directory, filename, max_size, sizes
+    )
+    future.add_done_callback(_log_failure)
+    return filename
+
+
+def discard_image(filename, directory, sizes):
+    """Remove a stored image and all its variants."""
+    for name in all_variants(filename, sizes):
+        try:
+            os.remove(os.path.join(directory, name))
+        except FileNotFoundError:
+            pass
+
+
+def image_variant(filename, directory, size=None, webp=False):
+    """
+    Name of the requested variant if it has been rendered. Falls back to
+    the stored file itself (None for WebP), which covers images saved
+    before variants existed and ones still being processed.
+    """
+    name = variant_name(filename, size, webp)
+    if name == filename or os.path.exists(os.path.join(directory, name)):
+        return name
+    return None if webp else filename
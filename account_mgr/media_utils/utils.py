@@ -1,45 +1,68 @@
- 
 import os
-import secrets
-from PIL import Image
 from account_mgr import app
-from flask import Blueprint
+from flask import Blueprint, url_for
 from flask_login import current_user
-from werkzeug.utils import secure_filename
+from account_mgr.database.models import User
+from .images import store_image, discard_image, image_variant
 
 
 img_utils = Blueprint(
     "img_utils", __name__, template_folder="templates", static_folder="static"
 )
 
+# Shipped pictures that must never be deleted
+DEFAULT_PICTURES = ("default.jpg", "default.png")
+
+
+def media_dir():
+    return os.path.join(app.root_path, "static/media")
+
 
 def save_user_picture(form_picture):
-    # Generate a random hexadecimal name for the image
-    random_hex = secrets.token_hex(8)
-    _, f_ext = os.path.splitext(form_picture.filename)
-    
-    # Sanitize the filename using secure_filename
-    picture_fn = secure_filename(random_hex + f_ext)
-    
-    # Define the picture path
-    picture_path = os.path.join(
-        app.root_path, "static/media", picture_fn
+    # Content-hash name; resized JPEG/PNG + WebP sizes render in the background
+    picture_fn = store_image(
+        form_picture,
+        media_dir(),
+        max_size=app.config["IMAGE_MAX_SIZE"],
+        sizes=app.config["IMAGE_SIZES"],
+        workers=app.config["IMAGE_WORKERS"],
     )
-    
-    # Remove the existing user profile picture if it exists
-    if os.path.exists(
-        os.path.join(app.root_path, "static/media", current_user.user_profile)):
-        os.remove(os.path.join(app.root_path, "static/media", current_user.user_profile))
-    
-    # Resize the image
-    output_size = (750, 750)
-    i = Image.open(form_picture)
-    i.thumbnail(output_size)
-    i.save(picture_path)
-    
+
+    # Remove the existing user profile picture, unless another user
+    # uploaded the same image (identical uploads share their files)
+    old_picture = current_user.user_profile
+    if (
+        old_picture
+        and old_picture != picture_fn
+        and old_picture not in DEFAULT_PICTURES
+        and not User.query.filter(
+            User.user_profile == old_picture, User.id != current_user.id
+        ).first()
+    ):
+        discard_image(old_picture, media_dir(), app.config["IMAGE_SIZES"])
+
     return picture_fn
 
 
+def avatar_urls(picture):
+    """
+    Static URLs of each avatar size ("sm", "md", "lg") as (src, webp)
+    pairs, and whether every variant exists yet. `webp` is None until
+    rendered; `src` falls back to the stored picture.
+    """
+    urls, complete = {}, True
+    for size in (*app.config["IMAGE_SIZES"], "lg"):
+        variant = None if size == "lg" else size
+        src = image_variant(picture, media_dir(), variant)
+        webp = image_variant(picture, media_dir(), variant, webp=True)
+        complete = complete and webp is not None
+        urls[size] = (
+            url_for("static", filename="media/" + src),
+            url_for("static", filename="media/" + webp) if webp else None,
+        )
+    return urls, complete
+
+
 def allowed_file(filename):
     """Check if the uploaded file is allowed."""
     return (
@@ -49,18 +72,10 @@ def allowed_file(filename):
 
 
 def save_picture(form_picture):
-    # Generate a random hexadecimal name for the image
-    random_hex = secrets.token_hex(8)
-    _, f_ext = os.path.splitext(form_picture.filename)
-    picture_fn = random_hex + f_ext
-    picture_path = os.path.join(
-        app.config["UPLOAD_FOLDER"], secure_filename(picture_fn)
+    return store_image(
+        form_picture,
+        app.config["UPLOAD_FOLDER"],
+        max_size=700,
+        sizes=app.config["IMAGE_SIZES"],
+        workers=app.config["IMAGE_WORKERS"],
     )
-
-    # Resize the image
-    output_size = (700, 700) 
-    i = Image.open(form_picture)
-    i.thumbnail(output_size)
-    i.save(picture_path)
-
-    return picture_fn
\ No newline at end of file
@@ -0,0 +1,379 @@
+import os
+import re
+import hmac
+import atexit
+import json
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from flask import Response, abort, request
+from flask_login import current_user
+
+try:
+    import fcntl
+except ImportError:  # Windows: dead workers' files are never folded
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "account_mgr"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Per-endpoint row: these totals, then one count per latency bucket + Inf
+COUNT, LATENCY, QUERIES, DB_TIME, BYTES = range(5)
+TOTALS = 5
+
+# Dead workers' snapshots are folded into this file by the next scrape
+FOLDED_FILE = "folded.json"
+FOLD_LOCK_FILE = "fold.lock"
+SNAPSHOT_NAME = re.compile(r"^(\d+)-\d+\.json$")
+
+# Request-local counters, cheaper to reach than flask.g from cursor events
+_local = threading.local()
+
+
+class MetricsRegistry:
+    """
+    Per-endpoint request totals for this process. Each worker writes a
+    snapshot to METRICS_DIR from a daemon thread, and a scrape merges the
+    snapshots of every worker, live or not, so totals never go backwards.
+    """
+
+    def __init__(self, directory, buckets, flush_interval):
+        self.directory = directory
+        self.buckets = tuple(buckets)
+        self.flush_interval = flush_interval
+        self._reset()
+
+    def _reset(self):
+        # Also runs in a forked child, where the parent's lock may be held
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._path = os.path.join(
+            self.directory, f"{os.getpid()}-{time.time_ns()}.json"
+        )
+        self._flusher = None
+
+    def _row(self, endpoint):
+        row = self._stats.get(endpoint)
+        if row is None:
+            row = self._stats[endpoint] = [0] * (TOTALS + len(self.buckets) + 1)
+        return row
+
+    def observe(self, endpoint, seconds, queries, db_time, size):
+        bucket = TOTALS + bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            row = self._row(endpoint)
+            row[COUNT] += 1
+            row[LATENCY] += seconds
+            row[QUERIES] += queries
+            row[DB_TIME] += db_time
+            row[BYTES] += size
+            row[bucket] += 1
+        if self._flusher is None:
+            self._start_flusher()
+
+    def observe_queries(self, endpoint, queries, db_time):
+        """SQL a request's background work ran after its response was sent."""
+        with self._lock:
+            row = self._row(endpoint)
+            row[QUERIES] += queries
+            row[DB_TIME] += db_time
+        if self._flusher is None:
+            self._start_flusher()
+
+    # ---------- FILES ----------
+    def flush(self):
+        with self._lock:
+            if not self._stats:
+                return
+            data = {"buckets": self.buckets, "stats": self._stats}
+            payload = json.dumps(data, separators=(",", ":"))
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self._path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(payload)
+        os.replace(tmp, self._path)
+
+    def _start_flusher(self):
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="metrics-flush", daemon=True
+            )
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Could not write request metrics")
+
+    def _read(self, name):
+        try:
+            with open(os.path.join(self.directory, name)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if tuple(data["buckets"]) != self.buckets:
+            # Written before METRICS_BUCKETS changed; cannot be merged
+            return None
+        return data
+
+    def _fold_dead(self, names):
+        """
+        Add the snapshots of exited workers to FOLDED_FILE and delete them,
+        so restarts and max_requests recycling do not leave a file behind
+        for every scrape to parse. FOLDED_FILE lists the names it has taken
+        in, so a fold interrupted before the deletes never counts twice.
+        """
+        dead = [
+            name
+            for name in names
+            if (match := SNAPSHOT_NAME.match(name))
+            and not _pid_alive(int(match.group(1)))
+        ]
+        if not dead:
+            return
+
+        with open(os.path.join(self.directory, FOLD_LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                folded = self._read(FOLDED_FILE) or {
+                    "buckets": self.buckets,
+                    "stats": {},
+                    "files": [],
+                }
+                files = set(folded["files"]) & set(os.listdir(self.directory))
+                for name in dead:
+                    data = None if name in files else self._read(name)
+                    if data is not None:
+                        _merge(folded["stats"], data["stats"])
+                    files.add(name)
+                folded["files"] = sorted(files)
+
+                path = os.path.join(self.directory, FOLDED_FILE)
+                with open(f"{path}.tmp", "w") as f:
+                    json.dump(folded, f, separators=(",", ":"))
+                os.replace(f"{path}.tmp", path)
+                for name in dead:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        pass
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def collect(self):
+        """Merged per-endpoint rows of every process sharing METRICS_DIR."""
+        self.flush()
+        merged = {}
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return merged
+        if fcntl:
+            self._fold_dead(names)
+            names = os.listdir(self.directory)
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            data = self._read(name)
+            if data is not None:
+                _merge(merged, data["stats"])
+        return merged
+
+
+def _merge(total, stats):
+    for endpoint, row in stats.items():
+        into = total.setdefault(endpoint, [0] * len(row))
+        for i, value in enumerate(row):
+            into[i] += value
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ---------- BACKGROUND WORK ----------
+class QueryCounter:
+    """
+    SQL run for one request by other threads (report fetches, exports).
+    Until the request is recorded it adds to the request's own totals;
+    after that, straight to the endpoint's.
+    """
+
+    def __init__(self, registry, endpoint):
+        self.registry = registry
+        self.endpoint = endpoint
+        self.queries = 0
+        self.db_time = 0.0
+        self.recorded = False
+        self._lock = threading.Lock()
+
+    def add(self, queries, db_time):
+        with self._lock:
+            if not self.recorded:
+                self.queries += queries
+                self.db_time += db_time
+                return
+        self.registry.observe_queries(self.endpoint, queries, db_time)
+
+    def close(self):
+        """Mark the request recorded; returns the queries and time so far."""
+        with self._lock:
+            self.recorded = True
+            return self.queries, self.db_time
+
+
+def request_counter():
+    """The current request's QueryCounter, to hand to a worker thread."""
+    return getattr(_local, "counter", None)
+
+
+@contextmanager
+def counted(counter):
+    """Count the SQL this thread runs inside the block towards `counter`."""
+    if counter is None:
+        yield
+        return
+    saved = _local.__dict__.copy()
+    _local.queries = 0
+    _local.db_time = 0.0
+    try:
+        yield
+    finally:
+        counter.add(_local.queries, _local.db_time)
+        # Pool threads are reused; leave nothing counting after the block
+        _local.__dict__.clear()
+        _local.__dict__.update(saved)
+
+
+# ---------- EXPOSITION ----------
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(stats, buckets):
+    """Prometheus text exposition of merged per-endpoint rows."""
+    latency = f"{METRIC_PREFIX}_request_duration_seconds"
+    lines = [
+        f"# HELP {latency} Time to build the response, by endpoint.",
+        f"# TYPE {latency} histogram",
+    ]
+    bounds = [*(repr(float(b)) for b in buckets), "+Inf"]
+    for endpoint, row in sorted(stats.items()):
+        label = f'endpoint="{_label(endpoint)}"'
+        cumulative = 0
+        for bound, count in zip(bounds, row[TOTALS:]):
+            cumulative += count
+            lines.append(f'{latency}_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f"{latency}_sum{{{label}}} {row[LATENCY]}")
+        lines.append(f"{latency}_count{{{label}}} {row[COUNT]}")
+
+    counters = (
+        ("db_queries_total", QUERIES, "SQL statements executed, by endpoint."),
+        ("db_seconds_total", DB_TIME, "Time spent in SQL statements, by endpoint."),
+        ("response_bytes_total", BYTES, "Response body bytes sent, by endpoint."),
+    )
+    for suffix, index, help_text in counters:
+        name = f"{METRIC_PREFIX}_{suffix}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for endpoint, row in sorted(stats.items()):
+            lines.append(f'{name}{{endpoint="{_label(endpoint)}"}} {row[index]}')
+    return "\n".join(lines) + "\n"
+
+
+# ---------- HOOKS ----------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    _local.query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    try:
+        _local.db_time += time.perf_counter() - _local.query_start
+        _local.queries += 1
+    except AttributeError:
+        # A thread that has never served a request (pools, startup)
+        pass
+
+
+def setup_metrics(app):
+    """
+    Time every request and count its SQL statements, and serve the totals
+    on /metrics for a scraper holding METRICS_TOKEN (as a Bearer token) or
+    for a signed-in super admin.
+    """
+    registry = MetricsRegistry(
+        app.config["METRICS_DIR"],
+        app.config["METRICS_BUCKETS"],
+        app.config["METRICS_FLUSH_INTERVAL"],
+    )
+    token = app.config["METRICS_TOKEN"]
+
+    app.extensions["metrics"] = registry
+    # Counts inherited over a fork belong to the parent's file
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=registry._reset)
+    # Keep the last few seconds of a worker that exits cleanly
+    atexit.register(registry.flush)
+
+    @app.before_request
+    def start_request_metrics():
+        _local.queries = 0
+        _local.db_time = 0.0
+        _local.counter = QueryCounter(registry, request.endpoint or "NO_ENDPOINT")
+        _local.start = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = getattr(_local, "start", None)
+        if start is not None:
+            _local.start = None
+            queries, db_time = _local.counter.close()
+            _local.counter = None
+            registry.observe(
+                request.endpoint or "NO_ENDPOINT",
+                time.perf_counter() - start,
+                _local.queries + queries,
+                _local.db_time + db_time,
+                response.content_length or 0,
+            )
+        return response
+
+    def metrics():
+        auth = request.authorization
+        scraper = (
+            token
+            and auth is not None
+            and auth.type == "bearer"
+            and hmac.compare_digest(auth.token or "", token)
+        )
+        if not scraper and not (
+            current_user.is_authenticated and current_user.is_super_admin
+        ):
+            abort(code=403)
+        return Response(
+            render_metrics(registry.collect(), registry.buckets),
+            content_type=PROMETHEUS_CONTENT_TYPE,
+        )
+
+    app.add_url_rule("/metrics", endpoint="metrics", view_func=metrics)
+    return registry
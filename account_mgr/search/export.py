@@ -0,0 +1,215 @@
+import tempfile
+from itertools import islice
+from account_mgr.lazy_ import xlsxwriter
+from account_mgr.database.models import (
+    D14Reading,
+    MeterReading,
+    ClosingSession,
+    CoinsTransaction,
+    PaperTransaction,
+    CreditTransaction,
+)
+
+
+# Rows read into each DataFrame chunk when streaming a sheet from the database
+EXPORT_BATCH_SIZE = 10_000
+
+# Rows inspected to size the column widths of each sheet
+WIDTH_SAMPLE_SIZE = 200
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+# ---------- SHEET SPECS ----------
+# (header, column, kind) per sheet. `kind` picks the vectorised formatting
+# applied in frames.format_frame:
+#   None        value as read
+#   "na"        empty/zero values become "N/A" (the old `value or "N/A"`)
+#   "date"      dd-mm-YYYY
+#   "datetime"  dd-mm-YYYY hh:mm AM/PM
+# Section comes from the owning closing session through an outer join.
+SECTION = ("Section", ClosingSession.section, "na")
+
+closing_session_spec = [
+    ("ID", ClosingSession.id, None),
+    ("Section", ClosingSession.section, None),
+    ("Admin Username", ClosingSession.admin_user_name, "na"),
+    ("Date Created", ClosingSession.date_created, "datetime"),
+]
+
+meter_reading_spec = [
+    ("ID", MeterReading.id, None),
+    SECTION,
+    ("Super 1 Opening", MeterReading.super_1_opening, None),
+    ("Super 2 Opening", MeterReading.super_2_opening, None),
+    ("Super 1 Closing", MeterReading.super_1_closing, None),
+    ("Super 2 Closing", MeterReading.super_2_closing, None),
+    ("Sale Liter", MeterReading.liters_sold, None),
+    ("RTT", MeterReading.gsa_test_draw, "na"),
+    ("Price", MeterReading.price, None),
+    ("Total", MeterReading.total, None),
+    ("CSA Name", MeterReading.csa_name, None),
+    ("Date of Sale", MeterReading.date_of_sale, "date"),
+    ("Date Created", MeterReading.date_created, "datetime"),
+]
+
+d14_spec = [
+    ("ID", D14Reading.id, None),
+    SECTION,
+    ("D1 Opening", D14Reading.d1_opening, None),
+    ("D1 Closing", D14Reading.d1_closing, None),
+    ("D2 Opening", D14Reading.d2_opening, None),
+    ("D2 Closing", D14Reading.d2_closing, None),
+    ("D3 Opening", D14Reading.d3_opening, None),
+    ("D3 Closing", D14Reading.d3_closing, None),
+    ("D4 Opening", D14Reading.d4_opening, None),
+    ("D4 Closing", D14Reading.d4_closing, None),
+    ("RTT", D14Reading.rtt_liters, "na"),
+    ("Sale Liter", D14Reading.liters_sold, None),
+    ("Price", D14Reading.price, None),
+    ("Total", D14Reading.total, None),
+    ("CSA Name", D14Reading.csa_name, None),
+    ("Date of Sale", D14Reading.date_of_sale, "date"),
+    ("Date Created", D14Reading.date_created, "datetime"),
+]
+
+credit_spec = [
+    ("ID", CreditTransaction.id, None),
+    SECTION,
+    ("GCB", CreditTransaction.gcb, None),
+    ("MoMo", CreditTransaction.momo, None),
+    ("Tingg", CreditTransaction.tingg, None),
+    ("Zenith", CreditTransaction.zenith, None),
+    ("Republic", CreditTransaction.republic, None),
+    ("Prudential", CreditTransaction.prudential, None),
+    ("ADB", CreditTransaction.adb, None),
+    ("Stanbic", CreditTransaction.stanbic, None),
+    ("Ecobank", CreditTransaction.ecobank, None),
+    ("Fidelity", CreditTransaction.fidelity, None),
+    ("Credit AB", CreditTransaction.credit_ab, None),
+    ("Credit CF", CreditTransaction.credit_cf, None),
+    ("Credit ZM", CreditTransaction.credit_gc, None),
+    ("Credit WL", CreditTransaction.credit_wl, None),
+    ("Soc Staff Credit", CreditTransaction.soc_staff_credit, None),
+    ("Water Bill", CreditTransaction.water_bill, None),
+    ("ECG Bill", CreditTransaction.ecg_bill, None),
+    ("Genset", CreditTransaction.genset, None),
+    ("Approve Misc", CreditTransaction.approve_miscellaneous, None),
+    ("Collection AB", CreditTransaction.collection_ab, None),
+    ("Collection WL", CreditTransaction.collection_wl, None),
+    ("Collection GC", CreditTransaction.collection_gc, None),
+    ("Collection CV", CreditTransaction.collection_cv, None),
+    ("Lube (1L)", CreditTransaction.lube_1_liter, None),
+    ("Lube Drum", CreditTransaction.lube_drum, None),
+    ("Duster Collection", CreditTransaction.duster_collection, None),
+    ("Total Collections", CreditTransaction.total_collection, None),
+    ("Total Credit/E-Cash", CreditTransaction.total_credit, None),
+    ("Cash to Bank", CreditTransaction.cash_to_bank, None),
+    ("Grand Total", CreditTransaction.grand_total, None),
+    ("Date", CreditTransaction.date_created, "date"),
+]
+
+paper_spec = [
+    ("ID", PaperTransaction.id, None),
+    SECTION,
+    ("₵200", PaperTransaction.note_200, None),
+    ("₵100", PaperTransaction.note_100, None),
+    ("₵50", PaperTransaction.note_50, None),
+    ("₵20", PaperTransaction.note_20, None),
+    ("₵10", PaperTransaction.note_10, None),
+    ("₵5", PaperTransaction.note_5, None),
+    ("₵2", PaperTransaction.note_2, None),
+    ("₵1", PaperTransaction.note_1, None),
+    ("Date", PaperTransaction.date_created, "date"),
+]
+
+coins_spec = [
+    ("ID", CoinsTransaction.id, None),
+    SECTION,
+    ("₵2 coin", CoinsTransaction.coin_5, None),
+    ("₵1 coin", CoinsTransaction.coin_2, None),
+    ("50 ps", CoinsTransaction.coin_1, None),
+    ("Date", CoinsTransaction.date_created, "date"),
+]
+
+
+def spec_columns(spec):
+    """Sheet headers for a spec."""
+    return [header for header, _, _ in spec]
+
+
+closing_session_cols = spec_columns(closing_session_spec)
+meter_reading_cols = spec_columns(meter_reading_spec)
+d14_cols = spec_columns(d14_spec)
+credit_cols = spec_columns(credit_spec)
+paper_cols = spec_columns(paper_spec)
+coins_cols = spec_columns(coins_spec)
+
+
+# ---------- STREAMING WORKBOOK ----------
+def column_widths(columns, sample_rows):
+    """Size each column from its header and a bounded sample of mapped rows."""
+    widths = [len(col) for col in columns]
+    for row in sample_rows:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(str(value)))
+    return [width + 2 for width in widths]
+
+
+def write_sheet(workbook, header_format, sheet_name, columns, rows, skip_empty):
+    """Stream mapped `rows` into a new worksheet, sizing columns from a sample."""
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_SIZE))
+    if not sample and skip_empty:
+        return False
+
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    for i, width in enumerate(column_widths(columns, sample)):
+        worksheet.set_column(i, i, width)
+
+    # Format headers and freeze the first row
+    for col_num, value in enumerate(columns):
+        worksheet.write(0, col_num, value, header_format)
+    worksheet.freeze_panes(1, 0)
+
+    row_num = 0
+    for batch in (sample, rows):
+        for row_num, values in enumerate(batch, start=row_num + 1):
+            worksheet.write_row(row_num, 0, values)
+    return True
+
+
+def build_workbook(sheets, skip_empty=False, progress=None):
+    """
+    Write `sheets` to a temp-file-backed XLSX using xlsxwriter's
+    constant_memory mode and return the open file rewound to the start.
+
+    `sheets` is a list of (sheet_name, columns, rows) tuples where `rows`
+    is a lazy iterable of row tuples, so only one chunk of rows is alive
+    at a time. With `skip_empty`, sheets without rows are left out.
+    `progress(done, total)` is called after each sheet.
+    """
+    output = tempfile.TemporaryFile()
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+
+    # Header format
+    header_format = workbook.add_format(
+        {
+            "bold": True,
+            "text_wrap": True,
+            "valign": "vcenter",
+            "align": "center",
+            "bg_color": "#D9E1F2",  # light blue shade
+            "border": 1,
+        }
+    )
+
+    for done, (sheet_name, columns, rows) in enumerate(sheets, 1):
+        write_sheet(workbook, header_format, sheet_name, columns, rows, skip_empty)
+        if progress:
+            progress(done, len(sheets))
+
+    workbook.close()
+    output.seek(0)
+    return output
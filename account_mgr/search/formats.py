@@ -0,0 +1,147 @@
+import io
+import csv
+import shutil
+import mimetypes
+import zipfile
+import tempfile
+from itertools import chain
+from sqlalchemy import Integer, Numeric
+from .export import build_workbook, spec_columns
+from .frames import frame_rows
+
+
+# Formats double as file extensions; send_file picks the mimetype from them
+EXPORT_FORMATS = ("xlsx", "csv", "parquet", "arrow")
+
+mimetypes.add_type("application/vnd.apache.parquet", ".parquet")
+mimetypes.add_type("application/vnd.apache.arrow.file", ".arrow")
+
+
+# ---------- CSV ----------
+def csv_chunks(columns, frames):
+    """Yield the header line and then each DataFrame chunk as encoded CSV."""
+    header = io.StringIO()
+    csv.writer(header).writerow(columns)
+    yield header.getvalue().encode("utf-8")
+    for df in frames:
+        yield df.to_csv(index=False, header=False, lineterminator="\r\n").encode(
+            "utf-8"
+        )
+
+
+def write_csv(output, spec, frames):
+    for chunk in csv_chunks(spec_columns(spec), frames):
+        output.write(chunk)
+
+
+# ---------- ARROW / PARQUET ----------
+def arrow_schema(spec):
+    """
+    Arrow types from the spec's SQL columns: Numeric stays decimal so
+    Parquet/Arrow keep exact cents, Integer is int64, the rest is text.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for header, column, kind in spec:
+        sql_type = column.type
+        if kind in (None, "na") and isinstance(sql_type, Numeric):
+            arrow_type = pa.decimal128(sql_type.precision, sql_type.scale)
+        elif kind in (None, "na") and isinstance(sql_type, Integer):
+            arrow_type = pa.int64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(header, arrow_type))
+    return pa.schema(fields)
+
+
+def record_batches(schema, frames):
+    """Turn DataFrame chunks into RecordBatches; "N/A" numbers become nulls."""
+    import pyarrow as pa
+
+    numeric = [f.name for f in schema if not pa.types.is_string(f.type)]
+    text = [f.name for f in schema if pa.types.is_string(f.type)]
+    for df in frames:
+        df[numeric] = df[numeric].replace({"N/A": None})
+        df[text] = df[text].map(lambda v: None if v is None else str(v))
+        yield pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def write_parquet(output, spec, frames):
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(spec)
+    with pq.ParquetWriter(output, schema) as writer:
+        for batch in record_batches(schema, frames):
+            writer.write_batch(batch)
+
+
+def write_arrow(output, spec, frames):
+    import pyarrow as pa
+
+    schema = arrow_schema(spec)
+    with pa.ipc.new_file(output, schema) as writer:
+        for batch in record_batches(schema, frames):
+            writer.write_batch(batch)
+
+
+SHEET_WRITERS = {
+    "csv": write_csv,
+    "parquet": write_parquet,
+    "arrow": write_arrow,
+}
+
+
+# ---------- BUILD ----------
+def _non_empty(frames):
+    """Drop empty chunks so a sheet with no rows yields nothing at all."""
+    return (df for df in frames if not df.empty)
+
+
+def build_export(sheets, export_format, skip_empty=False, progress=None):
+    """
+    Write `sheets` ((sheet_name, spec, frames) tuples, frames being a lazy
+    stream of formatted DataFrame chunks) in `export_format` and return
+    (file rewound to the start, extension). XLSX keeps every sheet in one
+    workbook; the other formats are one file per sheet, zipped when there
+    is more than one.
+    """
+    if export_format == "xlsx":
+        workbook_sheets = [
+            (sheet_name, spec_columns(spec), frame_rows(frames))
+            for sheet_name, spec, frames in sheets
+        ]
+        output = build_workbook(
+            workbook_sheets, skip_empty=skip_empty, progress=progress
+        )
+        return output, "xlsx"
+
+    write = SHEET_WRITERS[export_format]
+    extension = export_format
+    output = tempfile.TemporaryFile()
+
+    if len(sheets) == 1:
+        sheet_name, spec, frames = sheets[0]
+        write(output, spec, _non_empty(frames))
+        if progress:
+            progress(1, 1)
+        output.seek(0)
+        return output, extension
+
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for done, (sheet_name, spec, frames) in enumerate(sheets, 1):
+            frames = _non_empty(frames)
+            first = next(frames, None)
+            if first is not None or not skip_empty:
+                frames = frames if first is None else chain([first], frames)
+                # Parquet needs a seekable sink, so stage each member on disk
+                with tempfile.TemporaryFile() as part:
+                    write(part, spec, frames)
+                    part.seek(0)
+                    with archive.open(f"{sheet_name}.{extension}", "w") as member:
+                        shutil.copyfileobj(part, member)
+            if progress:
+                progress(done, len(sheets))
+
+    output.seek(0)
+    return output, "zip"
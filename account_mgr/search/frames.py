@@ -0,0 +1,67 @@
+from sqlalchemy import Integer, Numeric, func, select
+from account_mgr import db
+from account_mgr.lazy_ import pd
+from account_mgr.database.models import ClosingSession
+from .export import EXPORT_BATCH_SIZE, spec_columns
+
+
+DATE_FORMATS = {"date": "%d-%m-%Y", "datetime": "%d-%m-%Y %I:%M %p"}
+
+
+def spec_select(spec, model, *filters):
+    """
+    Core select of exactly the spec's columns. Rows of other models get
+    their closing session's section through an outer join.
+    """
+    columns = [column.label(f"c{i}") for i, (_, column, _) in enumerate(spec)]
+    stmt = select(*columns).select_from(model)
+    if model is not ClosingSession:
+        stmt = stmt.outerjoin(ClosingSession, model.session_id == ClosingSession.id)
+    return stmt.where(*filters).order_by(model.id)
+
+
+def format_frame(df, spec):
+    """Apply each column's display kind with vectorised operations."""
+    for header, _, kind in spec:
+        col = df[header]
+        if kind == "na":
+            df[header] = col.where(col.notna() & ~col.isin([0, ""]), "N/A")
+        elif kind in DATE_FORMATS:
+            df[header] = pd.to_datetime(col).dt.strftime(DATE_FORMATS[kind])
+    # Plain None for missing values; xlsxwriter, csv and Arrow all take it
+    return df.astype(object).where(df.notna(), None)
+
+
+def read_frames(stmt, spec, chunksize=EXPORT_BATCH_SIZE):
+    """
+    Stream `stmt` into formatted DataFrame chunks with headers from `spec`.
+    Integer columns are nullable Int64 and Numeric columns stay Decimal,
+    so cents are never rounded through float.
+    """
+    dtypes = {
+        f"c{i}": "Int64"
+        for i, (_, column, _) in enumerate(spec)
+        if isinstance(column.type, Integer)
+    }
+    headers = spec_columns(spec)
+    with db.engine.connect().execution_options(stream_results=True) as conn:
+        for chunk in pd.read_sql(
+            stmt, conn, chunksize=chunksize, dtype=dtypes, coerce_float=False
+        ):
+            chunk.columns = headers
+            yield format_frame(chunk, spec)
+
+
+def frame_rows(frames):
+    """Row tuples from a stream of DataFrame chunks (for xlsxwriter)."""
+    for df in frames:
+        yield from df.itertuples(index=False, name=None)
+
+
+def spec_totals(spec, *filters):
+    """Sum every Numeric column of `spec` in SQL, keyed by attribute name."""
+    numeric = [column for _, column, _ in spec if isinstance(column.type, Numeric)]
+    stmt = select(
+        *[func.coalesce(func.sum(column), 0).label(column.key) for column in numeric]
+    ).where(*filters)
+    return db.session.execute(stmt).mappings().one()
@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from account_mgr import app
+from account_mgr.metrics_ import counted, request_counter
+
+
+logger = logging.getLogger(__name__)
+
+# Export kind -> builder(progress=..., **params) returning (file, download_name)
+EXPORT_BUILDERS = {}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def register_export(kind):
+    """Register a workbook builder that export jobs of `kind` will run."""
+
+    def decorator(builder):
+        EXPORT_BUILDERS[kind] = builder
+        return builder
+
+    return decorator
+
+
+# ---------- JOB STATE ----------
+# Every job is a JSON state file next to its output in EXPORT_DIR, so any
+# worker process can answer a poll or serve the download.
+def export_dir():
+    path = app.config["EXPORT_DIR"]
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def is_job_id(job_id):
+    try:
+        return uuid.UUID(hex=job_id).hex == job_id
+    except ValueError:
+        return False
+
+
+def _state_path(job_id):
+    return os.path.join(export_dir(), f"{job_id}.json")
+
+
+def output_path(job_id):
+    return os.path.join(export_dir(), f"{job_id}.out")
+
+
+def read_job(job_id):
+    """Return the job state dict, or None for unknown or malformed ids."""
+    if not is_job_id(job_id):
+        return None
+    try:
+        with open(_state_path(job_id), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_job(job_id, **state):
+    path = _state_path(job_id)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+    return state
+
+
+# ---------- WORKER POOL ----------
+def _get_executor():
+    """Start this process's pool and purge thread on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config["EXPORT_WORKERS"],
+                thread_name_prefix="export-job",
+            )
+            threading.Thread(
+                target=_purge_loop, name="export-purge", daemon=True
+            ).start()
+        return _executor
+
+
+def _forget_executor():
+    # A forked child must not reuse the parent's (dead) worker threads
+    global _executor
+    _executor = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_executor)
+
+
+def submit_export(kind, user_id, **params):
+    """Queue an export build and return its job id."""
+    if kind not in EXPORT_BUILDERS:
+        raise ValueError(f"Unknown export kind: {kind!r}")
+
+    job_id = uuid.uuid4().hex
+    state = _write_job(
+        job_id,
+        kind=kind,
+        user_id=user_id,
+        status="queued",
+        progress=0,
+        created=time.time(),
+    )
+    # The build's SQL is counted towards the endpoint that queued it
+    _get_executor().submit(_run_job, job_id, state, params, request_counter())
+    return job_id
+
+
+def _run_job(job_id, state, params, counter=None):
+    builder = EXPORT_BUILDERS[state["kind"]]
+
+    def progress(done, total):
+        percent = int(done * 100 / total) if total else 100
+        _write_job(job_id, **{**state, "status": "running", "progress": percent})
+
+    with app.app_context(), counted(counter):
+        try:
+            _write_job(job_id, **{**state, "status": "running"})
+            output, filename = builder(progress=progress, **params)
+
+            tmp = f"{output_path(job_id)}.tmp"
+            with output, open(tmp, "wb") as f:
+                shutil.copyfileobj(output, f)
+            os.replace(tmp, output_path(job_id))
+
+            _write_job(
+                job_id,
+                **{**state, "status": "done", "progress": 100, "filename": filename},
+            )
+        except Exception:
+            logger.exception("Export job %s failed", job_id)
+            _write_job(job_id, **{**state, "status": "failed"})
+
+
+# ---------- EXPIRY ----------
+def purge_expired_exports():
+    """Delete job state and output files untouched for EXPORT_TTL seconds."""
+    cutoff = time.time() - app.config["EXPORT_TTL"]
+    removed = 0
+    for entry in os.scandir(export_dir()):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            # Another worker got there first
+            pass
+    return removed
+
+
+def _purge_loop():
+    while True:
+        time.sleep(app.config["EXPORT_PURGE_INTERVAL"])
+        try:
+            purge_expired_exports()
+        except Exception:
+            logger.exception("Export purge failed")
@@ -1,18 +1,46 @@
 import io
-import pandas as pd
+import os
+import threading
 from enum import Enum
-from sqlalchemy import or_
-from account_mgr import db
-from flask import send_file
-from num2words import num2words
+from sqlalchemy import String, cast, inspect
+from sqlalchemy.orm import Session, contains_eager
+from concurrent.futures import ThreadPoolExecutor
+from account_mgr import app, db
+from account_mgr.lazy_ import pd, num2words
+from account_mgr.metrics_ import counted, request_counter
+from flask import send_file, Response, stream_with_context
 from .message import message_map
 from datetime import datetime, time
-from flask_login import login_required
+from flask_login import current_user, login_required
 from datetime import datetime, time, date
 from flask import redirect, url_for, flash
-from flask import render_template, Blueprint, flash, request
+from flask import render_template, Blueprint, flash, request, jsonify, abort
+from flask import get_template_attribute
 from account_mgr.super_admin.routes import super_admin_required
+from account_mgr.database.summary import (
+    DIESEL_SECTION,
+    RECONCILIATION_SECTION,
+    PAPER_DENOMINATIONS,
+    COIN_DENOMINATIONS,
+    combine_sections,
+    refresh_daily_summary,
+    summary_range_totals,
+)
 from .form import TransactionReportForm, PerPageForm, CashSummaryForm
+from .jobs import register_export, submit_export, read_job, output_path
+from .formats import EXPORT_FORMATS, build_export, csv_chunks
+from .frames import spec_select, read_frames, spec_totals
+from .export import (
+    XLSX_MIMETYPE,
+    spec_columns,
+    closing_session_spec,
+    meter_reading_spec,
+    d14_spec,
+    credit_spec,
+    paper_spec,
+    coins_spec,
+)
+from account_mgr.database.pagination import listing_page
 from account_mgr.database.models import (
     D14Reading,
     MeterReading,
@@ -51,33 +79,180 @@ REPORT_TYPE_MAP = {
 }
 
 
-def generate_report(report_type, start_date, end_date):
+# ReportType.value -> lowercase
+REPORT_TYPE_SLUGS = {value: key for key, value in REPORT_TYPE_MAP.items()}
+
+
+REPORT_MODELS = {
+    ReportType.METER_READING.value: (MeterReading, MeterReading.date_of_sale),
+    ReportType.D14_READING.value: (D14Reading, D14Reading.date_of_sale),
+    ReportType.CREDIT.value: (CreditTransaction, CreditTransaction.date_created),
+    ReportType.PAPER.value: (PaperTransaction, PaperTransaction.date_created),
+    ReportType.COINS.value: (CoinsTransaction, CoinsTransaction.date_created),
+    ReportType.CLOSING_SESSION.value: (ClosingSession, ClosingSession.date_created),
+}
+
+# ReportType.value -> row macro in result_rows.html
+RESULT_ROWS = {
+    ReportType.METER_READING.value: "meter_rows",
+    ReportType.D14_READING.value: "d14_rows",
+    ReportType.CREDIT.value: "credit_rows",
+    ReportType.PAPER.value: "paper_rows",
+    ReportType.COINS.value: "coins_rows",
+    ReportType.CLOSING_SESSION.value: "closing_rows",
+}
+
+# ReportType.value -> (sheet name, spec) for exports
+EXPORT_SHEETS = {
+    ReportType.METER_READING.value: ("Meter_Reading", meter_reading_spec),
+    ReportType.D14_READING.value: ("Diesel_D1_D4", d14_spec),
+    ReportType.CREDIT.value: ("Credit_Transactions", credit_spec),
+    ReportType.PAPER.value: ("Paper_Cash", paper_spec),
+    ReportType.COINS.value: ("Coins", coins_spec),
+    ReportType.CLOSING_SESSION.value: ("Closing_Session", closing_session_spec),
+}
+
+
+def report_filter(report_type, start_date, end_date):
+    """Date-range filter for a single (non-ALL) report type."""
     start_datetime = datetime.combine(start_date, time.min)
     end_datetime = datetime.combine(end_date, time.max)
 
-    mapping = {
-        ReportType.METER_READING.value: (MeterReading, MeterReading.date_of_sale),
-        ReportType.D14_READING.value: (D14Reading, D14Reading.date_of_sale),
-        ReportType.CREDIT.value: (CreditTransaction, CreditTransaction.date_created),
-        ReportType.PAPER.value: (PaperTransaction, PaperTransaction.date_created),
-        ReportType.COINS.value: (CoinsTransaction, CoinsTransaction.date_created),
-        ReportType.CLOSING_SESSION.value: (ClosingSession, ClosingSession.date_created),
+    model, field = REPORT_MODELS[report_type]
+    return field.between(start_datetime, end_datetime)
+
+
+def result_columns(model):
+    """
+    Columns a result table can be sorted and filtered on, by attribute
+    name. Rows of models without their own section show their closing
+    session's.
+    """
+    columns = {
+        attr.key: getattr(model, attr.key) for attr in inspect(model).column_attrs
     }
+    columns.setdefault("section", ClosingSession.section)
+    return columns
+
+
+RESULT_COLUMNS = {
+    key: result_columns(model) for key, (model, _) in REPORT_MODELS.items()
+}
+
+
+def report_query(
+    report_type, start_date, end_date, sort=None, descending=False, filters=None
+):
+    """
+    Build the date-range query for a single (non-ALL) report type, sorted
+    on `sort` and narrowed by `filters` ({column: text}, matched as a
+    case-insensitive substring). Unknown columns are ignored.
+    """
+    model, _ = REPORT_MODELS[report_type]
+    columns = RESULT_COLUMNS[report_type]
+    query = model.query.filter(report_filter(report_type, start_date, end_date))
+
+    # Rows show their session's section; load it in the same SELECT
+    # instead of one lazy query per row, and make it sortable/filterable.
+    if model is not ClosingSession:
+        query = query.outerjoin(model.session).options(contains_eager(model.session))
+
+    for key, value in (filters or {}).items():
+        if key in columns and value:
+            query = query.filter(
+                cast(columns[key], String).icontains(value, autoescape=True)
+            )
 
+    order = columns.get(sort, model.id)
+    # id breaks ties so rows never shift between pages
+    return query.order_by(order.desc() if descending else order.asc(), model.id)
+
+
+def report_page(report_type, start_date, end_date, page=1, per_page=None, **options):
+    """One page of a result table; the total comes from a COUNT query."""
+    return report_query(report_type, start_date, end_date, **options).paginate(
+        page=page,
+        per_page=per_page or app.config["RESULTS_PER_PAGE"],
+        max_per_page=app.config["RESULTS_MAX_PER_PAGE"],
+        error_out=False,
+    )
+
+
+def report_frames(report_type, start_date, end_date):
+    """Lazily stream one report type as formatted DataFrame chunks."""
+    model, _ = REPORT_MODELS[report_type]
+    _, spec = EXPORT_SHEETS[report_type]
+    stmt = spec_select(spec, model, report_filter(report_type, start_date, end_date))
+    return read_frames(stmt, spec)
+
+
+def report_types_for(report_type):
+    """Expand ALL into every concrete report type; None if unknown."""
     if report_type == ReportType.ALL.value:
-        result_dict = {}
-        for key, (model, field) in mapping.items():
-            result_dict[key] = model.query.filter(
-                field.between(start_datetime, end_datetime)
-            ).all()
-        return result_dict
-    else:
-        model_field = mapping.get(report_type)
-        if not model_field:
-            return None
+        return list(REPORT_MODELS)
+    if report_type in REPORT_MODELS:
+        return [report_type]
+    return None
+
 
-        model, field = model_field
-        return model.query.filter(field.between(start_datetime, end_datetime)).all()
+_report_executor = None
+_report_executor_lock = threading.Lock()
+
+
+def report_executor():
+    """Process-wide pool for ALL reports, so REPORT_PARALLELISM also caps
+    the extra connections taken across concurrent requests."""
+    global _report_executor
+    with _report_executor_lock:
+        if _report_executor is None:
+            _report_executor = ThreadPoolExecutor(
+                max_workers=app.config["REPORT_PARALLELISM"],
+                thread_name_prefix="report-fetch",
+            )
+        return _report_executor
+
+
+def _forget_report_executor():
+    global _report_executor
+    _report_executor = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_report_executor)
+
+
+def fetch_report_page(report_type, start_date, end_date, counter=None):
+    """
+    Fetch the first page of one report on its own session and pooled
+    connection. Rows come back detached with their columns and joined
+    session loaded, which is all the result templates read. Its SQL is
+    counted towards the request that owns `counter`.
+    """
+    with app.app_context(), counted(counter):
+        with Session(db.engine, expire_on_commit=False) as session:
+            query = report_query(report_type, start_date, end_date)
+            return query.with_session(session).paginate(
+                page=1, per_page=app.config["RESULTS_PER_PAGE"], error_out=False
+            )
+
+
+def generate_report(report_type, start_date, end_date):
+    """First page of every table in the report, keyed by report type."""
+    keys = report_types_for(report_type)
+    if keys is None:
+        return None
+
+    if len(keys) > 1 and app.config["REPORT_PARALLELISM"] > 1:
+        counter = request_counter()
+        futures = {
+            key: report_executor().submit(
+                fetch_report_page, key, start_date, end_date, counter
+            )
+            for key in keys
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+    return {key: report_page(key, start_date, end_date) for key in keys}
 
 
 # ---------------- ROUTE -----------------
@@ -87,7 +262,7 @@ def generate_report(report_type, start_date, end_date):
 def transaction_report():
     form = TransactionReportForm()
     per_page_form = PerPageForm()
-    results = []
+    tables = {}
     report_type = None
     report_title = "Station Report"
 
@@ -95,379 +270,199 @@ def transaction_report():
         # Normalize lowercase form value to ReportType value
         report_type = REPORT_TYPE_MAP.get(form.report_type.data)
         if report_type:
-            results = generate_report(
+            tables = generate_report(
                 report_type, form.start_date.data, form.end_date.data
             )
 
-    if results is None:
+    # Totals come from each table's COUNT query, not from loaded rows
+    count = sum(page.total for page in tables.values()) if tables else 0
+    if tables is None:
         flash(message=message_map["error_invalid_choice"], category="error")
-    elif results:
-        if isinstance(results, dict):  # ALL
-            count = sum(len(v) for v in results.values())
-            if count > 0:
-                flash(
-                    message=f"{message_map['success']} {count} items found.",
-                    category="success",
-                )
-            else:
-                flash(message=message_map["error"], category="error")
-                results = []
-        else:  # single model list
-            count = len(results)
-            if count > 0:
-                flash(
-                    message=f"{message_map['success']} {count} items found.",
-                    category="success",
-                )
-            else:
-                flash(message=message_map["error"], category="error")
-                results = []
+        tables = {}
+    elif count > 0:
+        flash(
+            message=f"{message_map['success']} {count} items found.",
+            category="success",
+        )
     else:
         flash(message=message_map["error"], category="error")
 
-    # Pagination (example for meter readings)
-    page = request.args.get(key="page", default=1, type=int)
+    # Keyset pagination (example for meter readings)
     per_page = request.args.get(key="per_page", default=5, type=int)
-    per_page_form.per_page.data = per_page
+    per_page = min(max(per_page, 1), 100)
+    per_page_form.per_page.data = str(per_page)
+
+    # Credit totals are summed in SQL rather than row by row in the template
+    credit_totals = None
+    if count and ReportType.CREDIT.value in tables:
+        credit_totals = spec_totals(
+            credit_spec,
+            report_filter(
+                ReportType.CREDIT.value, form.start_date.data, form.end_date.data
+            ),
+        )
+
+    # Each result table fetches further pages, sorts and filters here
+    rows_urls = {
+        key: url_for(
+            "transactions_bp.report_rows",
+            report_type=REPORT_TYPE_SLUGS[key],
+            start_date=form.start_date.data,
+            end_date=form.end_date.data,
+        )
+        for key in tables
+    }
 
-    meter_readings = MeterReading.query.order_by(
-        MeterReading.date_of_sale.desc()
-    ).paginate(page=page, per_page=per_page)
+    # Lazy: queried only if the template reads it
+    meter_readings = listing_page(
+        MeterReading, cursor=request.args.get(key="cursor"), per_page=per_page
+    )
 
     return render_template(
         "transaction_result.html",
         form=form,
-        results=results,
+        tables=tables,
+        rows_urls=rows_urls,
         ReportType=ReportType,
         meter_readings=meter_readings,
+        credit_totals=credit_totals,
         report_type=report_type,
         report_title=report_title,
         per_page_form=per_page_form,
     )
 
 
-@transactions_bp.route(rule="/account_mgr/transaction/export", methods=["GET"])
+@transactions_bp.route(rule="/account_mgr/transaction/report/rows", methods=["GET"])
 @login_required
 @super_admin_required
-def export_transaction_report():
-    # read query params
-    start_date_str = request.args.get(key="start_date")
-    end_date_str = request.args.get(key="end_date")
-    report_type = request.args.get(key="report_type", default="all")
+def report_rows():
+    """One page of a result table as JSON, for sorting, filtering and paging."""
+    report_type = request.args.get(key="report_type", default="").lower()
+    report_type = REPORT_TYPE_MAP.get(report_type)
+    if report_type not in REPORT_MODELS:
+        return jsonify(error=message_map["error_invalid_choice"]), 400
 
     try:
-        start_date = (
-            datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            if start_date_str
-            else date.today()
-        )
-        end_date = (
-            datetime.strptime(end_date_str, "%Y-%m-%d").date()
-            if end_date_str
-            else date.today()
-        )
-    except Exception:
-        flash(message="Invalid date format. Use YYYY-MM-DD.", category="error")
-        return redirect(url_for(endpoint="transactions_bp.transaction_report"))
+        start_date, end_date = export_dates(request.args)
+    except ValueError:
+        return jsonify(error="Invalid date format. Use YYYY-MM-DD."), 400
+
+    page = report_page(
+        report_type,
+        start_date,
+        end_date,
+        page=request.args.get(key="page", default=1, type=int),
+        per_page=request.args.get(key="per_page", type=int),
+        sort=request.args.get(key="sort"),
+        descending=request.args.get(key="dir") == "desc",
+        # f_<column>=<text> narrows the table on that column
+        filters={
+            key[2:]: value
+            for key, value in request.args.items()
+            if key.startswith("f_")
+        },
+    )
+    render_rows = get_template_attribute(
+        "result_rows.html", RESULT_ROWS[report_type]
+    )
+    return jsonify(
+        html=str(render_rows(page.items)),
+        page=page.page,
+        pages=page.pages,
+        per_page=page.per_page,
+        total=page.total,
+        first=page.first,
+        last=page.last,
+    )
 
-    # get results
-    report_type_value = REPORT_TYPE_MAP.get(report_type.lower(), ReportType.ALL.value)
-    results = generate_report(report_type_value, start_date, end_date)
 
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+def export_dates(args):
+    """Read start_date/end_date (YYYY-MM-DD) from `args`, defaulting to today."""
+    start_date_str = args.get(key="start_date")
+    end_date_str = args.get(key="end_date")
+    start_date = (
+        datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        if start_date_str
+        else date.today()
+    )
+    end_date = (
+        datetime.strptime(end_date_str, "%Y-%m-%d").date()
+        if end_date_str
+        else date.today()
+    )
+    return start_date, end_date
 
-        def export_df(sheet_name, rows, columns, row_mapper):
-            """Helper to export consistent DataFrame with formatting."""
-            df = pd.DataFrame([row_mapper(r) for r in rows], columns=columns)
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-            # Apply formatting
-            workbook = writer.book
-            worksheet = writer.sheets[sheet_name]
-
-            # Header format
-            header_format = workbook.add_format(
-                {
-                    "bold": True,
-                    "text_wrap": True,
-                    "valign": "vcenter",
-                    "align": "center",
-                    "bg_color": "#D9E1F2",  # light blue shade
-                    "border": 1,
-                }
-            )
 
-            # Format headers
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-
-            # Auto-adjust column widths
-            for i, col in enumerate(df.columns):
-                col_width = max(df[col].astype(str).map(len).max(), len(col)) + 2
-                worksheet.set_column(i, i, col_width)
-
-            # Freeze the first row
-            worksheet.freeze_panes(1, 0)
-
-        # ---------- MAPPINGS ----------
-        def closing_session_mapper(r):
-            return [
-                r.id,
-                r.section,
-                r.admin_user_name or "N/A",
-                r.date_created.strftime("%d-%m-%Y %I:%M %p"),
-            ]
-
-        closing_session_cols = ["ID", "Section", "Admin Username", "Date Created"]
-
-        def meter_reading_mapper(r):
-            return [
-                r.id,
-                getattr(r.session, "section", "N/A"),
-                r.super_1_opening,
-                r.super_2_opening,
-                r.super_1_closing,
-                r.super_2_closing,
-                r.liters_sold,
-                r.gsa_test_draw or "N/A",
-                r.price,
-                r.total,
-                r.csa_name,
-                r.date_of_sale.strftime("%d-%m-%Y"),
-                r.date_created.strftime("%d-%m-%Y %I:%M %p"),
-            ]
-
-        meter_reading_cols = [
-            "ID",
-            "Section",
-            "Super 1 Opening",
-            "Super 2 Opening",
-            "Super 1 Closing",
-            "Super 2 Closing",
-            "Sale Liter",
-            "RTT",
-            "Price",
-            "Total",
-            "CSA Name",
-            "Date of Sale",
-            "Date Created",
-        ]
+def transaction_sheets(report_type, start_date, end_date):
+    """Resolve `report_type` and build its (sheet name, spec, frames) tuples."""
+    report_type_value = REPORT_TYPE_MAP.get(report_type.lower(), ReportType.ALL.value)
+    sheets = [
+        (*EXPORT_SHEETS[key], report_frames(key, start_date, end_date))
+        for key in report_types_for(report_type_value)
+    ]
+    return report_type_value, sheets
 
-        def d14_mapper(r):
-            return [
-                r.id,
-                getattr(r.session, "section", "N/A"),
-                # r.section,
-                r.d1_opening,
-                r.d1_closing,
-                r.d2_opening,
-                r.d2_closing,
-                r.d3_opening,
-                r.d3_closing,
-                r.d4_opening,
-                r.d4_closing,
-                r.rtt_liters or "N/A",
-                r.liters_sold,
-                r.price,
-                r.total,
-                r.csa_name,
-                r.date_of_sale.strftime("%d-%m-%Y"),
-                r.date_created.strftime("%d-%m-%Y %I:%M %p"),
-            ]
-
-        d14_cols = [
-            "ID",
-            "Section",
-            "D1 Opening",
-            "D1 Closing",
-            "D2 Opening",
-            "D2 Closing",
-            "D3 Opening",
-            "D3 Closing",
-            "D4 Opening",
-            "D4 Closing",
-            "RTT",
-            "Sale Liter",
-            "Price",
-            "Total",
-            "CSA Name",
-            "Date of Sale",
-            "Date Created",
-        ]
 
-        def credit_mapper(r):
-            return [
-                r.id,
-                getattr(r.session, "section", "N/A"),
-                r.gcb,
-                r.momo,
-                r.tingg,
-                r.zenith,
-                r.republic,
-                r.prudential,
-                r.adb,
-                r.stanbic,
-                r.ecobank,
-                r.fidelity,
-                r.credit_ab,
-                r.credit_cf,
-                r.credit_gc,
-                r.credit_wl,
-                r.soc_staff_credit,
-                r.water_bill,
-                r.ecg_bill,
-                r.genset,
-                r.approve_miscellaneous,
-                r.collection_ab,
-                r.collection_wl,
-                r.collection_gc,
-                r.collection_cv,
-                r.lube_1_liter,
-                r.lube_drum,
-                r.duster_collection,
-                r.total_collection,
-                r.total_credit,
-                r.cash_to_bank,
-                r.grand_total,
-                r.date_created.strftime("%d-%m-%Y"),
-            ]
-
-        credit_cols = [
-            "ID",
-            "Section",
-            "GCB",
-            "MoMo",
-            "Tingg",
-            "Zenith",
-            "Republic",
-            "Prudential",
-            "ADB",
-            "Stanbic",
-            "Ecobank",
-            "Fidelity",
-            "Credit AB",
-            "Credit CF",
-            "Credit ZM",
-            "Credit WL",
-            "Soc Staff Credit",
-            "Water Bill",
-            "ECG Bill",
-            "Genset",
-            "Approve Misc",
-            "Collection AB",
-            "Collection WL",
-            "Collection GC",
-            "Collection CV",
-            "Lube (1L)",
-            "Lube Drum",
-            "Duster Collection",
-            "Total Collections",
-            "Total Credit/E-Cash",
-            "Cash to Bank",
-            "Grand Total",
-            "Date",
-        ]
+def transaction_export_name(start_date, end_date, extension):
+    if start_date == end_date:
+        return f"transaction_report_{start_date.strftime('%d-%m-%Y')}.{extension}"
+    return f"transaction_report_{start_date.strftime('%d-%m-%Y')} to {end_date.strftime('%d-%m-%Y')}.{extension}"
+
+
+@register_export("transaction")
+def transaction_export(
+    report_type, start_date, end_date, progress=None, export_format="xlsx"
+):
+    """Build the transaction report file; returns (file, download name)."""
+    # stream each sheet straight from the database into a temp file
+    report_type_value, sheets = transaction_sheets(report_type, start_date, end_date)
+    # ALL leaves out empty sheets; a single report always gets its sheet
+    output, extension = build_export(
+        sheets,
+        export_format,
+        skip_empty=report_type_value == ReportType.ALL.value,
+        progress=progress,
+    )
+    return output, transaction_export_name(start_date, end_date, extension)
 
-        def paper_mapper(r):
-            return [
-                r.id,
-                getattr(r.session, "section", "N/A"),
-                r.note_200,
-                r.note_100,
-                r.note_50,
-                r.note_20,
-                r.note_10,
-                r.note_5,
-                r.note_2,
-                r.note_1,
-                r.date_created.strftime("%d-%m-%Y"),
-            ]
-
-        paper_cols = [
-            "ID",
-            "Section",
-            "₵200",
-            "₵100",
-            "₵50",
-            "₵20",
-            "₵10",
-            "₵5",
-            "₵2",
-            "₵1",
-            "Date",
-        ]
 
-        def coins_mapper(r):
-            return [
-                r.id,
-                getattr(r.session, "section", "N/A"),
-                r.coin_5,
-                r.coin_2,
-                r.coin_1,
-                r.date_created.strftime("%d-%m-%Y"),
-            ]
-
-        coins_cols = ["ID", "Section", "₵2 coin", "₵1 coin", "50 ps", "Date"]
-
-        # ---------- EXPORT ----------
-        if isinstance(results, dict):  # ALL
-            for key, rows in results.items():
-                if not rows:
-                    continue
-                if key == ReportType.CLOSING_SESSION.value:
-                    export_df(
-                        "Closing_Session",
-                        rows,
-                        closing_session_cols,
-                        closing_session_mapper,
-                    )
-                elif key == ReportType.METER_READING.value:
-                    export_df(
-                        "Meter_Reading", rows, meter_reading_cols, meter_reading_mapper
-                    )
-                elif key == ReportType.D14_READING.value:
-                    export_df("Diesel_D1_D4", rows, d14_cols, d14_mapper)
-                elif key == ReportType.CREDIT.value:
-                    export_df("Credit_Transactions", rows, credit_cols, credit_mapper)
-                elif key == ReportType.PAPER.value:
-                    export_df("Paper_Cash", rows, paper_cols, paper_mapper)
-                elif key == ReportType.COINS.value:
-                    export_df("Coins", rows, coins_cols, coins_mapper)
-        else:  # single report
-            if report_type_value == ReportType.CLOSING_SESSION.value:
-                export_df(
-                    "Closing_Session",
-                    results,
-                    closing_session_cols,
-                    closing_session_mapper,
-                )
-            elif report_type_value == ReportType.METER_READING.value:
-                export_df(
-                    "Meter_Reading", results, meter_reading_cols, meter_reading_mapper
-                )
-            elif report_type_value == ReportType.D14_READING.value:
-                export_df("Diesel_D1_D4", results, d14_cols, d14_mapper)
-            elif report_type_value == ReportType.CREDIT.value:
-                export_df("Credit_Transactions", results, credit_cols, credit_mapper)
-            elif report_type_value == ReportType.PAPER.value:
-                export_df("Paper_Cash", results, paper_cols, paper_mapper)
-            elif report_type_value == ReportType.COINS.value:
-                export_df("Coins", results, coins_cols, coins_mapper)
+@transactions_bp.route(rule="/account_mgr/transaction/export", methods=["GET"])
+@login_required
+@super_admin_required
+def export_transaction_report():
+    # read query params
+    report_type = request.args.get(key="report_type", default="all")
+    export_format = request.args.get(key="format", default="xlsx").lower()
 
-    output.seek(0)
+    if export_format not in EXPORT_FORMATS:
+        flash(message=f"Unsupported export format: {export_format}", category="error")
+        return redirect(url_for(endpoint="transactions_bp.transaction_report"))
 
-    if start_date == end_date:
-        filename = f"transaction_report_{start_date.strftime('%d-%m-%Y')}.xlsx"
-    else:
-        filename = f"transaction_report_{start_date.strftime('%d-%m-%Y')} to {end_date.strftime('%d-%m-%Y')}.xlsx"
+    try:
+        start_date, end_date = export_dates(request.args)
+    except Exception:
+        flash(message="Invalid date format. Use YYYY-MM-DD.", category="error")
+        return redirect(url_for(endpoint="transactions_bp.transaction_report"))
 
-    return send_file(
-        output,
-        as_attachment=True,
-        download_name=filename,
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    # A single CSV sheet streams chunk by chunk straight off the cursor
+    report_type_value, sheets = transaction_sheets(report_type, start_date, end_date)
+    if export_format == "csv" and len(sheets) == 1:
+        _, spec, frames = sheets[0]
+        response = Response(
+            stream_with_context(csv_chunks(spec_columns(spec), frames)),
+            mimetype="text/csv",
+        )
+        response.headers.set(
+            "Content-Disposition",
+            "attachment",
+            filename=transaction_export_name(start_date, end_date, "csv"),
+        )
+        return response
+
+    output, filename = transaction_export(
+        report_type, start_date, end_date, export_format=export_format
     )
+    return send_file(output, as_attachment=True, download_name=filename)
 
 
 def amount_to_words(amount):
@@ -480,9 +475,9 @@ def amount_to_words(amount):
     cedis = int(amount)
     pesewas = int(round((amount - cedis) * 100))
 
-    cedis_words = num2words(cedis, lang="en").replace("-", " ").capitalize()
+    cedis_words = num2words.num2words(cedis, lang="en").replace("-", " ").capitalize()
     if pesewas > 0:
-        pesewas_words = num2words(pesewas, lang="en").replace("-", " ")
+        pesewas_words = num2words.num2words(pesewas, lang="en").replace("-", " ")
         return f"{cedis_words} Ghana cedis, {pesewas_words} pesewas"
     else:
         return f"{cedis_words} Ghana cedis only"
@@ -494,81 +489,23 @@ def cash_summary():
     form_cash = CashSummaryForm()
     cash_report_title = "Cash Summary Report"
 
-    def get_totals(
-        is_reconciliation=False, start_date=None, end_date=None, report_type="all"
-    ):
+    def get_totals(totals, report_type="all"):
         """Helper function to compute totals for either normal or reconciled entries."""
-        paper_totals = {f"note_{val}": 0 for val in [200, 100, 50, 20, 10, 5, 2, 1]}
-        coin_totals = {f"coin_{val}": 0 for val in [5, 2, 1]}
-
-        start_datetime = datetime.combine(start_date, time.min)
-        end_datetime = datetime.combine(end_date, time.max)
-
-        # ✅ Use correct filter based on reconciliation
-        if is_reconciliation:
-            paper_filter = PaperTransaction.is_reconciliation.is_(True)
-            coin_filter = CoinsTransaction.is_reconciliation.is_(True)
-        else:
-            paper_filter = or_(
-                PaperTransaction.is_reconciliation.is_(False),
-                PaperTransaction.is_reconciliation.is_(None),
-            )
-            coin_filter = or_(
-                CoinsTransaction.is_reconciliation.is_(False),
-                CoinsTransaction.is_reconciliation.is_(None),
-            )
+        include_paper = report_type in ["all", "paper"]
+        include_coins = report_type in ["all", "coins"]
 
-        # 🔹 Query paper only if user requested "all" or "paper"
-        paper_rows = []
-        if report_type in ["all", "paper"]:
-            paper_rows = PaperTransaction.query.filter(
-                paper_filter,
-                PaperTransaction.date_created.between(start_datetime, end_datetime),
-            ).all()
-
-            for row in paper_rows:
-                paper_totals["note_200"] += row.note_200 or 0
-                paper_totals["note_100"] += row.note_100 or 0
-                paper_totals["note_50"] += row.note_50 or 0
-                paper_totals["note_20"] += row.note_20 or 0
-                paper_totals["note_10"] += row.note_10 or 0
-                paper_totals["note_5"] += row.note_5 or 0
-                paper_totals["note_2"] += row.note_2 or 0
-                paper_totals["note_1"] += row.note_1 or 0
-
-        # 🔹 Query coins only if user requested "all" or "coins"
-        coins_rows = []
-        if report_type in ["all", "coins"]:
-            coins_rows = CoinsTransaction.query.filter(
-                coin_filter,
-                CoinsTransaction.date_created.between(start_datetime, end_datetime),
-            ).all()
-
-            for row in coins_rows:
-                coin_totals["coin_5"] += row.coin_5 or 0
-                coin_totals["coin_2"] += row.coin_2 or 0
-                coin_totals["coin_1"] += row.coin_1 or 0
+        # 🔹 Only keep the denominations the user requested
+        paper_totals = {
+            col: totals[col] if include_paper else 0 for col in PAPER_DENOMINATIONS
+        }
+        coin_totals = {
+            col: totals[col] if include_coins else 0 for col in COIN_DENOMINATIONS
+        }
 
         # 🔹 Total value (only include what was selected)
-        total_value = 0
-        if report_type in ["all", "paper"]:
-            total_value += (
-                paper_totals["note_200"] * 200
-                + paper_totals["note_100"] * 100
-                + paper_totals["note_50"] * 50
-                + paper_totals["note_20"] * 20
-                + paper_totals["note_10"] * 10
-                + paper_totals["note_5"] * 5
-                + paper_totals["note_2"] * 2
-                + paper_totals["note_1"] * 1
-            )
-
-        if report_type in ["all", "coins"]:
-            total_value += (
-                coin_totals["coin_5"] * 0.5
-                + coin_totals["coin_2"] * 2
-                + coin_totals["coin_1"] * 1
-            )
+        total_value = sum(
+            paper_totals[col] * value for col, value in PAPER_DENOMINATIONS.items()
+        ) + sum(coin_totals[col] * value for col, value in COIN_DENOMINATIONS.items())
 
         return paper_totals, coin_totals, total_value
 
@@ -586,31 +523,23 @@ def cash_summary():
         end_date = form_cash.end_date.data
         report_type = form_cash.cash_report_type.data
 
-        # 🔹 Fetch both normal and reconciled data, using report_type properly
-        paper_totals, coin_totals, total_value = get_totals(
-            False, start_date, end_date, report_type
-        )
+        # 🔹 Read the pre-aggregated daily rollup instead of the raw tables
+        totals = summary_range_totals(start_date, end_date)
+        normal = combine_sections(totals, lambda s: s != RECONCILIATION_SECTION)
+        reconciled = combine_sections(totals, lambda s: s == RECONCILIATION_SECTION)
+
+        paper_totals, coin_totals, total_value = get_totals(normal, report_type)
         rec_paper_totals, rec_coin_totals, rec_total_value = get_totals(
-            True, start_date, end_date, report_type
+            reconciled, report_type
         )
 
         # 🔹 Liters summary
-        s_rows = MeterReading.query.filter(
-            MeterReading.date_created.between(
-                datetime.combine(start_date, time.min),
-                datetime.combine(end_date, time.max),
-            )
-        ).all()
-
-        d_rows = D14Reading.query.filter(
-            D14Reading.date_created.between(
-                datetime.combine(start_date, time.min),
-                datetime.combine(end_date, time.max),
-            )
-        ).all()
-
-        total_s_liters = sum(row.liters_sold for row in s_rows)
-        total_d_liters = sum(row.liters_sold for row in d_rows)
+        total_s_liters = combine_sections(
+            totals, lambda s: s not in (DIESEL_SECTION, RECONCILIATION_SECTION)
+        )["liters_sold"]
+        total_d_liters = combine_sections(totals, lambda s: s == DIESEL_SECTION)[
+            "liters_sold"
+        ]
         combined_liters = total_s_liters + total_d_liters
 
         total_value_words = amount_to_words(total_value)
@@ -636,92 +565,42 @@ def cash_summary():
     )
 
 
-@transactions_bp.route(rule="account_mgr/cash_summary/export", methods=["GET"])
-@login_required
-def export_cash_summary():
-    # read query params (expected format YYYY-MM-DD from HTML date inputs)
-    start_date_str = request.args.get(key="start_date")
-    end_date_str = request.args.get(key="end_date")
-    report_type = request.args.get(key="cash_report_type", default="all")
-
-    try:
-        if start_date_str:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-        else:
-            start_date = date.today()
-        if end_date_str:
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
-        else:
-            end_date = date.today()
-    except Exception:
-        flash(
-            message="Invalid date format for export. Use YYYY-MM-DD.", category="error"
-        )
-        return redirect(url_for(endpoint="transactions_bp.cash_summary"))
+@register_export("cash_summary")
+def cash_summary_export(report_type, start_date, end_date, progress=None):
+    """Build the cash summary workbook; returns (file, download name)."""
+    # fetch the pre-aggregated daily rollup (normal and reconciled counts alike)
+    totals = summary_range_totals(start_date, end_date)
 
-    start_dt = datetime.combine(start_date, time.min)
-    end_dt = datetime.combine(end_date, time.max)
-
-    # fetch rows
-    paper_rows, coins_rows, s_rows, d_rows = [], [], [], []
-
-    if report_type in ["all", "paper"]:
-        paper_rows = PaperTransaction.query.filter(
-            PaperTransaction.date_created.between(start_dt, end_dt)
-        ).all()
-
-    if report_type in ["all", "coins"]:
-        coins_rows = CoinsTransaction.query.filter(
-            CoinsTransaction.date_created.between(start_dt, end_dt)
-        ).all()
-
-    s_rows = MeterReading.query.filter(
-        MeterReading.date_created.between(start_dt, end_dt)
-    ).all()
-    d_rows = D14Reading.query.filter(
-        D14Reading.date_created.between(start_dt, end_dt)
-    ).all()
+    if start_date == end_date:
+        filename = f"cash_summary_{start_date.strftime('%d-%m-%Y')}.xlsx"
+    else:
+        filename = f"cash_summary_{start_date.strftime('%d-%m-%Y')} to {end_date.strftime('%d-%m-%Y')}.xlsx"
 
     # 🛑 If no data at all, return empty Excel
-    if not (paper_rows or coins_rows or s_rows or d_rows):
+    if not totals:
         output = io.BytesIO()
         with pd.ExcelWriter(output, engine="xlsxwriter"):
             pass  # don't add any sheets, keep it empty
         output.seek(0)
-
-        if start_date == end_date:
-            filename = f"cash_summary_{start_date.strftime('%d-%m-%Y')}.xlsx"
-        else:
-            filename = f"cash_summary_{start_date.strftime('%d-%m-%Y')} to {end_date.strftime('%d-%m-%Y')}.xlsx"
-
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=filename,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        return output, filename
 
     # ✅ If rows exist, continue computing totals
-    paper_totals = {f"note_{val}": 0 for val in [200, 100, 50, 20, 10, 5, 2, 1]}
-    coin_totals = {f"coin_{val}": 0 for val in [5, 2, 1]}
-
-    for row in paper_rows:
-        paper_totals["note_200"] += row.note_200 or 0
-        paper_totals["note_100"] += row.note_100 or 0
-        paper_totals["note_50"] += row.note_50 or 0
-        paper_totals["note_20"] += row.note_20 or 0
-        paper_totals["note_10"] += row.note_10 or 0
-        paper_totals["note_5"] += row.note_5 or 0
-        paper_totals["note_2"] += row.note_2 or 0
-        paper_totals["note_1"] += row.note_1 or 0
-
-    for row in coins_rows:
-        coin_totals["coin_5"] += row.coin_5 or 0
-        coin_totals["coin_2"] += row.coin_2 or 0
-        coin_totals["coin_1"] += row.coin_1 or 0
-
-    total_s_liters = sum((row.liters_sold or 0) for row in s_rows)
-    total_d_liters = sum((row.liters_sold or 0) for row in d_rows)
+    all_sections = combine_sections(totals, lambda s: True)
+    paper_totals = {
+        col: all_sections[col] if report_type in ["all", "paper"] else 0
+        for col in PAPER_DENOMINATIONS
+    }
+    coin_totals = {
+        col: all_sections[col] if report_type in ["all", "coins"] else 0
+        for col in COIN_DENOMINATIONS
+    }
+
+    total_s_liters = combine_sections(
+        totals, lambda s: s not in (DIESEL_SECTION, RECONCILIATION_SECTION)
+    )["liters_sold"]
+    total_d_liters = combine_sections(totals, lambda s: s == DIESEL_SECTION)[
+        "liters_sold"
+    ]
     combined_liters = total_s_liters + total_d_liters
 
     # build DataFrames (same as before)...
@@ -793,16 +672,112 @@ def export_cash_summary():
         sheet_liters.freeze_panes(1, 0)
 
     output.seek(0)
-    if start_date == end_date:
-        filename = f"cash_summary_{start_date.strftime(format='%d-%m-%Y')}.xlsx"
-    else:
-        filename = f"cash_summary_{start_date.strftime(format='%d-%m-%Y')} to {end_date.strftime(format='%d-%m-%Y')}.xlsx"
+    return output, filename
+
+
+@transactions_bp.route(rule="account_mgr/cash_summary/export", methods=["GET"])
+@login_required
+def export_cash_summary():
+    # read query params (expected format YYYY-MM-DD from HTML date inputs)
+    report_type = request.args.get(key="cash_report_type", default="all")
 
+    try:
+        start_date, end_date = export_dates(request.args)
+    except Exception:
+        flash(
+            message="Invalid date format for export. Use YYYY-MM-DD.", category="error"
+        )
+        return redirect(url_for(endpoint="transactions_bp.cash_summary"))
+
+    output, filename = cash_summary_export(report_type, start_date, end_date)
     return send_file(
         output,
         as_attachment=True,
         download_name=filename,
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        mimetype=XLSX_MIMETYPE,
+    )
+
+
+# ---------------- BACKGROUND EXPORT JOBS -----------------
+# Export kind -> query parameter holding its report type
+EXPORT_REPORT_TYPE_ARGS = {
+    "transaction": "report_type",
+    "cash_summary": "cash_report_type",
+}
+
+
+def export_job_urls(job_id):
+    return {
+        "job_id": job_id,
+        "status_url": url_for("transactions_bp.export_job_status", job_id=job_id),
+        "download_url": url_for("transactions_bp.export_job_download", job_id=job_id),
+    }
+
+
+def owned_export_job(job_id):
+    """Return the caller's job state or abort with 404."""
+    job = read_job(job_id)
+    if job is None or job["user_id"] != current_user.id:
+        abort(404)
+    return job
+
+
+@transactions_bp.route(rule="/account_mgr/exports", methods=["POST"])
+@login_required
+@super_admin_required
+def start_export_job():
+    """Queue an export with the same parameters as the direct export links."""
+    kind = request.values.get("export", "transaction")
+    if kind not in EXPORT_REPORT_TYPE_ARGS:
+        return jsonify({"error": f"Unknown export: {kind}"}), 400
+
+    try:
+        start_date, end_date = export_dates(request.values)
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
+
+    params = {
+        "report_type": request.values.get(EXPORT_REPORT_TYPE_ARGS[kind], "all"),
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    if kind == "transaction":
+        params["export_format"] = request.values.get("format", "xlsx").lower()
+        if params["export_format"] not in EXPORT_FORMATS:
+            return jsonify({"error": "Unsupported export format."}), 400
+
+    job_id = submit_export(kind, user_id=current_user.id, **params)
+    return jsonify({"status": "queued", **export_job_urls(job_id)}), 202
+
+
+@transactions_bp.route(rule="/account_mgr/exports/<job_id>", methods=["GET"])
+@login_required
+@super_admin_required
+def export_job_status(job_id):
+    job = owned_export_job(job_id)
+    response = jsonify(
+        {
+            "status": job["status"],
+            "progress": job["progress"],
+            "filename": job.get("filename"),
+            **export_job_urls(job_id),
+        }
+    )
+    response.cache_control.no_store = True
+    return response
+
+
+@transactions_bp.route(rule="/account_mgr/exports/<job_id>/download", methods=["GET"])
+@login_required
+@super_admin_required
+def export_job_download(job_id):
+    job = owned_export_job(job_id)
+    if job["status"] != "done":
+        return jsonify({"status": job["status"], "progress": job["progress"]}), 409
+
+    # The mimetype follows the stored file name (.xlsx, .zip, .csv, ...)
+    return send_file(
+        output_path(job_id), as_attachment=True, download_name=job["filename"]
     )
 
 
@@ -819,6 +794,7 @@ def delete_meter_reading(reading_id):
     try:
         # Delete the entire ClosingSession
         db.session.delete(session)
+        refresh_daily_summary(session.session_date, session.section)
         db.session.commit()
         flash(
             message="Closing session (and all related data) deleted successfully.",
@@ -844,6 +820,7 @@ def delete_d14_reading(reading_id):
     try:
         # Delete the entire ClosingSession (cascade deletes all linked data)
         db.session.delete(session)
+        refresh_daily_summary(session.session_date, session.section)
         db.session.commit()
         flash(
             message="Closing session (and all related data) deleted successfully.",
@@ -0,0 +1,135 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+from sqlalchemy import column, delete, table
+from flask import current_app, session
+from flask.sessions import SecureCookieSessionInterface
+from flask_session import Session as FlaskSession
+
+
+logger = logging.getLogger(__name__)
+
+# Session key holding the last time the stored session expiry was pushed out
+TOUCHED_KEY = "_touched"
+
+SESSION_BACKENDS = ("cookie", "cachelib", "redis", "sqlalchemy")
+
+
+class PermanentCookieSessionInterface(SecureCookieSessionInterface):
+    """
+    Signed-cookie sessions that always carry PERMANENT_SESSION_LIFETIME,
+    without having to flag (and so rewrite) every session as permanent.
+    """
+
+    def get_expiration_time(self, app, session):
+        return datetime.now(timezone.utc) + app.permanent_session_lifetime
+
+
+def _cachelib_client(app):
+    from cachelib import FileSystemCache
+
+    return FileSystemCache(
+        app.config["SESSION_FILE_DIR"],
+        threshold=app.config["SESSION_FILE_THRESHOLD"],
+        mode=0o600,
+    )
+
+
+def _redis_client(app):
+    # Tests can hand in any redis-compatible client (e.g. fakeredis)
+    if app.config.get("SESSION_REDIS") is not None:
+        return app.config["SESSION_REDIS"]
+
+    import redis
+
+    return redis.from_url(app.config["SESSION_REDIS_URL"])
+
+
+def setup_sessions(app, db):
+    """
+    Install the session interface picked by SESSION_BACKEND:
+
+    - "cookie": Flask's signed cookie, no server-side storage.
+    - "cachelib": Flask-Session on a local FileSystemCache.
+    - "redis": Flask-Session on SESSION_REDIS, or a client for SESSION_REDIS_URL.
+    - "sqlalchemy": Flask-Session on the `sessions` table, with expired
+      rows purged by a background thread every SESSION_PURGE_INTERVAL.
+
+    Stored sessions are only written when they change; `touch_session`
+    keeps the expiry sliding with at most one write per
+    SESSION_TOUCH_INTERVAL.
+    """
+    backend = app.config["SESSION_BACKEND"]
+    if backend not in SESSION_BACKENDS:
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend!r}")
+
+    app.before_request(touch_session)
+
+    if backend == "cookie":
+        app.session_interface = PermanentCookieSessionInterface()
+        return app.session_interface
+
+    app.config["SESSION_TYPE"] = backend
+    if backend == "cachelib":
+        app.config["SESSION_CACHELIB"] = _cachelib_client(app)
+    elif backend == "redis":
+        app.config["SESSION_REDIS"] = _redis_client(app)
+    else:
+        app.config["SESSION_SQLALCHEMY"] = db
+
+    FlaskSession(app)
+
+    if backend == "sqlalchemy" and app.config["SESSION_PURGE_INTERVAL"]:
+        start_session_purge(app, db)
+    return app.session_interface
+
+
+def touch_session():
+    """Mark a live session modified once per interval so its expiry slides."""
+    if not session:
+        return None
+
+    now = int(time.time())
+    interval = current_app.config["SESSION_TOUCH_INTERVAL"]
+    if session.get(TOUCHED_KEY, 0) <= now - interval:
+        session[TOUCHED_KEY] = now
+    return None
+
+
+def delete_expired_sessions(db, table_name):
+    """Delete expired rows from the SQL session table; returns how many."""
+    sessions = table(table_name, column("expiry"))
+    # Flask-Session stores expiry as naive UTC
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    with db.engine.begin() as connection:
+        result = connection.execute(delete(sessions).where(sessions.c.expiry <= now))
+    return result.rowcount
+
+
+def start_session_purge(app, db):
+    """Delete expired SQL session rows from a daemon thread."""
+    interval = app.config["SESSION_PURGE_INTERVAL"]
+    table_name = app.config["SESSION_SQLALCHEMY_TABLE"]
+    stop = threading.Event()
+
+    def purge_loop():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    delete_expired_sessions(db, table_name)
+                except Exception:
+                    logger.exception("Expired session purge failed")
+
+    def start():
+        threading.Thread(
+            target=purge_loop, name="session-purge", daemon=True
+        ).start()
+
+    start()
+
+    # Threads do not survive a fork (gunicorn --preload)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=start)
+    return stop
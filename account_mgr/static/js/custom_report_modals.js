@@ -92,38 +92,72 @@ document.addEventListener("DOMContentLoaded", function () {
   let pinInput = document.getElementById("admin_pin");
   let submitBtn = document.getElementById("access-btn");
   let statusMsg = document.getElementById("pin-status");
+  let accessTrigger = document.querySelector(".access-control-trigger");
 
   submitBtn.disabled = true;
 
+  // A recent correct PIN leaves a grant; while it lasts the PIN may be blank
+  let granted = false;
+
+  // Wait for a pause in typing so each keystroke is not a bcrypt check
+  const PIN_CHECK_DELAY_MS = 400;
+  let pinTimer = null;
+
   pinInput.addEventListener("input", function () {
+    clearTimeout(pinTimer);
     if (pinInput.value.trim() === "") {
-      submitBtn.disabled = true;
-      statusMsg.textContent = "";
+      showGrant();
       return;
     }
 
+    pinTimer = setTimeout(checkPin, PIN_CHECK_DELAY_MS);
+  });
+
+  if (accessTrigger) {
+    // Blank PIN: the server only reports whether a grant is active
+    accessTrigger.addEventListener("click", function () {
+      if (pinInput.value.trim() === "") {
+        postPin("").then(showGrant);
+      }
+    });
+  }
+
+  function showGrant() {
+    submitBtn.disabled = !granted;
+    statusMsg.textContent = granted ? "✅ Admin access active" : "";
+    statusMsg.style.color = "green";
+  }
+
+  function postPin(pin) {
     const csrf = document.querySelector('meta[name="csrf--token"]').content;
 
-    fetch("/account_mgr/verify_pin", {
+    return fetch("/account_mgr/verify_pin", {
       method: "POST",
       headers: {
         "Content-Type": "application/x-www-form-urlencoded",
       },
-      body: `pin=${pinInput.value}&csrf_token=${csrf}`,
+      body: new URLSearchParams({ pin: pin, csrf_token: csrf }),
     })
       .then((res) => res.json())
       .then((data) => {
-        if (data.valid) {
-          statusMsg.textContent = "✅ PIN correct";
-          statusMsg.style.color = "green";
-          submitBtn.disabled = false;
-        } else {
-          statusMsg.textContent = "❌ Invalid PIN";
-          statusMsg.style.color = "red";
-          submitBtn.disabled = true;
-        }
+        granted = Boolean(data.granted);
+        return data;
       });
-  });
+  }
+
+  function checkPin() {
+    postPin(pinInput.value).then((data) => {
+      if (data.valid) {
+        statusMsg.textContent = "✅ PIN correct";
+        statusMsg.style.color = "green";
+        submitBtn.disabled = false;
+      } else {
+        statusMsg.textContent = data.error ? `❌ ${data.error}` : "❌ Invalid PIN";
+        statusMsg.style.color = "red";
+        submitBtn.disabled = true;
+      }
+    });
+  }
 });
 // End of Admin PIN Verification
 
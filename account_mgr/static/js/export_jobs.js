@@ -0,0 +1,61 @@
+// Run exports as background jobs: queue, poll progress, then download.
+// Links keep their direct export href as a fallback when this fails.
+document.addEventListener("DOMContentLoaded", function () {
+  const POLL_INTERVAL_MS = 1500;
+  const csrfMeta = document.querySelector('meta[name="csrf--token"]');
+
+  document.querySelectorAll("a[data-export-job]").forEach(function (link) {
+    link.addEventListener("click", function (event) {
+      if (!csrfMeta || link.dataset.busy) return;
+      event.preventDefault();
+
+      const label = link.innerHTML;
+      link.dataset.busy = "1";
+      link.classList.add("disabled");
+
+      const params = new URLSearchParams(new URL(link.href).search);
+      params.set("export", link.dataset.exportJob);
+
+      const finish = function () {
+        link.innerHTML = label;
+        link.classList.remove("disabled");
+        delete link.dataset.busy;
+      };
+
+      const fallback = function () {
+        finish();
+        window.location.href = link.href;
+      };
+
+      const poll = function (statusUrl) {
+        fetch(statusUrl, { headers: { Accept: "application/json" } })
+          .then((res) => res.json())
+          .then(function (job) {
+            if (job.status === "done") {
+              finish();
+              window.location.href = job.download_url;
+            } else if (job.status === "failed") {
+              fallback();
+            } else {
+              link.innerHTML = `<i class="fas fa-spinner fa-spin"></i> Exporting ${job.progress}%`;
+              setTimeout(() => poll(statusUrl), POLL_INTERVAL_MS);
+            }
+          })
+          .catch(fallback);
+      };
+
+      link.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Queued';
+      fetch(link.dataset.exportUrl, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/x-www-form-urlencoded",
+          "X-CSRFToken": csrfMeta.content,
+        },
+        body: params.toString(),
+      })
+        .then((res) => (res.ok ? res.json() : Promise.reject(res)))
+        .then((job) => poll(job.status_url))
+        .catch(fallback);
+    });
+  });
+});
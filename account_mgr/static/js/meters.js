@@ -1,4 +1,23 @@
 // meter_calculation.js
+
+// 🔹 One in-flight /api/session_snapshot request per section, shared by every
+// block below. Settled requests are dropped, so the next section change asks
+// again and the browser revalidates its copy (304 while unchanged).
+const sessionSnapshots = {};
+
+function fetchSessionSnapshot(section) {
+  if (!sessionSnapshots[section]) {
+    const request = fetch(
+      `/api/session_snapshot?section=${encodeURIComponent(section)}`
+    ).then((res) => res.json());
+    sessionSnapshots[section] = request;
+    request
+      .finally(() => delete sessionSnapshots[section])
+      .catch(() => {});
+  }
+  return sessionSnapshots[section];
+}
+
 document.addEventListener("DOMContentLoaded", function () {
   function setupMeterCalc(prefix, type = "super") {
     const fields = {};
@@ -165,12 +184,9 @@ document.addEventListener("DOMContentLoaded", function () {
     return sel ? sel.value : "S1S2";
   }
 
-  // Fetch meter total from backend (with section param)
+  // Fetch meter total from the session snapshot (with section param)
   function fetchMeterTotal() {
-    fetch(
-      `/get_meter_total?section=${encodeURIComponent(getSelectedSection())}`
-    )
-      .then((res) => res.json())
+    fetchSessionSnapshot(getSelectedSection())
       .then((data) => {
         meterTotal = parseFloat(data.meter_total) || 0;
         calcTotals(); // recalc on load with fetched value
@@ -277,19 +293,6 @@ document.addEventListener("DOMContentLoaded", () => {
     return sel ? sel.value : "S1S2";
   }
 
-  // 🔹 Fetch meter total from backend (with section param)
-  function fetchMeterTotal() {
-    fetch(
-      `/get_meter_total?section=${encodeURIComponent(getSelectedSection())}`
-    )
-      .then((res) => res.json())
-      .then((data) => {
-        meterTotal = parseFloat(data.meter_total) || 0;
-        calcTotals();
-      })
-      .catch(() => {}); // silent fail
-  }
-
   function sumFields(ids) {
     return ids.reduce((sum, id) => {
       const val = parseFloat(document.getElementById(id)?.value) || 0;
@@ -324,14 +327,13 @@ document.addEventListener("DOMContentLoaded", () => {
 
   let expectedCashToBank = 0;
 
-  // 🔹 Fetch cash_to_bank from backend (with section param)
-  function fetchCashToBank() {
-    fetch(
-      `/get_cash_to_bank?section=${encodeURIComponent(getSelectedSection())}`
-    )
-      .then((res) => res.json())
+  // 🔹 Fetch meter total and cash_to_bank from the session snapshot
+  function fetchSnapshot() {
+    fetchSessionSnapshot(getSelectedSection())
       .then((data) => {
+        meterTotal = parseFloat(data.meter_total) || 0;
         expectedCashToBank = parseFloat(data.cash_to_bank) || 0;
+        calcTotals();
       })
       .catch(() => {}); // silent fail
   }
@@ -397,14 +399,12 @@ document.addEventListener("DOMContentLoaded", () => {
     .querySelectorAll("input[data-denom]")
     .forEach((el) => el.addEventListener("input", calcPhysicalCash));
 
-  // 🔹 Initial fetches
-  fetchMeterTotal();
-  fetchCashToBank();
+  // 🔹 Initial fetch
+  fetchSnapshot();
 
   // 🔹 Re-fetch when section changes
   document.getElementById("section")?.addEventListener("change", () => {
-    fetchMeterTotal();
-    fetchCashToBank();
+    fetchSnapshot();
   });
 });
 // End of physical cash calculation
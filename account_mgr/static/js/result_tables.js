@@ -0,0 +1,126 @@
+// Server-side paging, sorting and column filtering for report result tables.
+// Each table[data-result-table] fetches its pages as JSON from data-rows-url.
+document.addEventListener("DOMContentLoaded", function () {
+  const FILTER_DELAY_MS = 300;
+
+  document.querySelectorAll("table[data-result-table]").forEach(function (table) {
+    const rowsUrl = table.dataset.rowsUrl;
+    const tbody = table.querySelector("tbody");
+    const pager = table.parentElement.querySelector("[data-result-pager]");
+    const headers = table.querySelectorAll("th[data-sort]");
+    if (!rowsUrl || !tbody || !pager) return;
+
+    const state = {
+      page: Number(pager.dataset.page) || 1,
+      pages: Number(pager.dataset.pages) || 0,
+      sort: null,
+      dir: "asc",
+      filterColumn: null,
+      filterValue: "",
+    };
+
+    // --- Filter toolbar: pick a column, type to narrow the rows ---
+    const toolbar = document.createElement("div");
+    toolbar.className = "d-flex gap-2 mb-2";
+    const columnSelect = document.createElement("select");
+    columnSelect.className = "form-select form-select-sm w-auto";
+    headers.forEach(function (th) {
+      columnSelect.add(new Option(th.textContent.trim(), th.dataset.sort));
+    });
+    const filterInput = document.createElement("input");
+    filterInput.type = "search";
+    filterInput.placeholder = "Filter...";
+    filterInput.className = "form-control form-control-sm w-auto";
+    toolbar.append(columnSelect, filterInput);
+    table.before(toolbar);
+
+    const load = function () {
+      const params = new URLSearchParams(new URL(rowsUrl, window.location.href).search);
+      params.set("page", state.page);
+      if (state.sort) {
+        params.set("sort", state.sort);
+        params.set("dir", state.dir);
+      }
+      if (state.filterColumn && state.filterValue) {
+        params.set(`f_${state.filterColumn}`, state.filterValue);
+      }
+
+      table.classList.add("opacity-50");
+      fetch(`${rowsUrl.split("?")[0]}?${params}`, {
+        headers: { Accept: "application/json" },
+      })
+        .then((res) => (res.ok ? res.json() : Promise.reject(res)))
+        .then(function (data) {
+          tbody.innerHTML = data.html;
+          state.page = data.page;
+          state.pages = data.pages;
+          renderPager(data);
+        })
+        .catch(function () {
+          pager.textContent = "Could not load rows. Please try again.";
+        })
+        .finally(() => table.classList.remove("opacity-50"));
+    };
+
+    // --- Pager ---
+    const pageButton = function (label, page, disabled) {
+      const button = document.createElement("button");
+      button.type = "button";
+      button.className = "btn btn-outline-secondary btn-sm";
+      button.innerHTML = label;
+      button.disabled = disabled;
+      button.addEventListener("click", function () {
+        state.page = page;
+        load();
+      });
+      return button;
+    };
+
+    const renderPager = function (data) {
+      const summary = document.createElement("span");
+      summary.textContent = data.total
+        ? `Showing ${data.first}-${data.last} of ${data.total}`
+        : "No rows match.";
+      const buttons = document.createElement("div");
+      buttons.className = "d-flex gap-1 align-items-center";
+      buttons.append(
+        pageButton('<i class="fas fa-chevron-left"></i>', state.page - 1, state.page <= 1),
+        document.createTextNode(` ${state.page} / ${Math.max(state.pages, 1)} `),
+        pageButton('<i class="fas fa-chevron-right"></i>', state.page + 1, state.page >= state.pages)
+      );
+      pager.replaceChildren(summary, buttons);
+    };
+
+    // The first page is rendered by the server; only add the buttons
+    if (state.pages > 1) renderPager(pager.dataset);
+
+    // --- Sorting: click a header, click again to reverse ---
+    headers.forEach(function (th) {
+      th.style.cursor = "pointer";
+      th.addEventListener("click", function () {
+        state.dir = state.sort === th.dataset.sort && state.dir === "asc" ? "desc" : "asc";
+        state.sort = th.dataset.sort;
+        state.page = 1;
+        headers.forEach((h) => h.removeAttribute("aria-sort"));
+        th.setAttribute("aria-sort", state.dir === "asc" ? "ascending" : "descending");
+        load();
+      });
+    });
+
+    // --- Filtering ---
+    let filterTimer = null;
+    const applyFilter = function () {
+      clearTimeout(filterTimer);
+      filterTimer = setTimeout(function () {
+        state.filterColumn = columnSelect.value;
+        state.filterValue = filterInput.value.trim();
+        state.page = 1;
+        load();
+      }, FILTER_DELAY_MS);
+    };
+    filterInput.addEventListener("input", applyFilter);
+    columnSelect.addEventListener("change", function () {
+      if (filterInput.value.trim()) applyFilter();
+    });
+  });
+});
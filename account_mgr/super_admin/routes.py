@@ -6,6 +6,15 @@ from dotenv import load_dotenv
 from sqlalchemy import inspect
 from flask_wtf.csrf import generate_csrf
 from account_mgr import db, bcrypt, logging
+from account_mgr.database.summary import refresh_daily_summary
+from account_mgr.database.slow_queries import slow_queries as recent_slow_queries
+from account_mgr.access_control.pin import (
+    has_grant,
+    revoke_grant,
+    has_edit_token,
+    issue_edit_token,
+)
+from account_mgr.csa_registration.attendants import attendant_choices, attendant_name
 from .form import (
     D14Form,
     LoginForm,
@@ -31,7 +40,6 @@ from flask import (
 from account_mgr.database.models import (
     User,
     Tenant,
-    CSAName,
     D14Reading,
     MeterReading,
     ClosingSession,
@@ -110,6 +118,8 @@ def seed_super_admin():
     except Exception as e:
         db.session.rollback()
         logging.error(f"❌ Error seeding super admin: {e}")
+        # Startup must not stamp the schema as initialised without an admin
+        raise
 
 
 @super_admin_secure.route(rule="/", methods=["GET", "POST"])
@@ -152,8 +162,8 @@ def secure_superlogin():
     csrf_token = generate_csrf()
     form.csrf_token.data = csrf_token
 
-    # 🔹 Debug log to console
-    print(f"🔑 New CSRF Token generated: {csrf_token}")
+    # 🔹 Debug log (never log the token itself)
+    current_app.logger.debug("🔑 New CSRF token generated for the login form")
     return render_template("login_layout.html", form=form)
 
 
@@ -173,10 +183,8 @@ def secure_adashboard():
     # It auto-resets every midnight (new day → new entries).
     closing_sessions = ClosingSession.query.filter_by(session_date=date.today()).all()
 
-    # Populate CSA Name dropdown for each form
-    csa_choices = [("0", "--Select CSA Name--")] + [
-        (str(c.id), c.attendant_name) for c in CSAName.query.all()
-    ]
+    # Populate CSA Name dropdown for each form (cached per process)
+    csa_choices = attendant_choices()
 
     for form in [s1s2_form, s3s4_form, d1d4_form]:
         if hasattr(form, "csa_name"):
@@ -232,7 +240,6 @@ def secure_adashboard():
                     create_if_missing=True,
                 )
 
-                csa = CSAName.query.get(int(s1s2_form.csa_name.data))
                 meter_reading = MeterReading(
                     section="S1S2",
                     super_1_opening=s1_opening,
@@ -244,10 +251,13 @@ def secure_adashboard():
                     price=price,
                     total=total,
                     date_of_sale=s1s2_form.date_of_sale.data,
-                    csa_name=csa.attendant_name if csa else "",
+                    csa_name=attendant_name(s1s2_form.csa_name.data),
                     session_id=closing_session.id,
                 )
                 db.session.add(meter_reading)
+                refresh_daily_summary(
+                    closing_session.session_date, closing_session.section
+                )
                 db.session.commit()
                 flash(message="S1 & S2 meter reading saved!", category="success")
             except Exception as e:
@@ -291,7 +301,6 @@ def secure_adashboard():
                     create_if_missing=True,
                 )
 
-                csa = CSAName.query.get(int(s3s4_form.csa_name.data))
                 meter_reading = MeterReading(
                     section="S3S4",
                     super_1_opening=s3_opening,
@@ -303,10 +312,13 @@ def secure_adashboard():
                     price=price,
                     total=total,
                     date_of_sale=s3s4_form.date_of_sale.data,
-                    csa_name=csa.attendant_name if csa else "",
+                    csa_name=attendant_name(s3s4_form.csa_name.data),
                     session_id=closing_session.id,
                 )
                 db.session.add(meter_reading)
+                refresh_daily_summary(
+                    closing_session.session_date, closing_session.section
+                )
                 db.session.commit()
                 flash(message="S3 & S4 meter reading saved!", category="success")
             except Exception:
@@ -354,7 +366,6 @@ def secure_adashboard():
                     create_if_missing=True,
                 )
 
-                csa = CSAName.query.get(int(d1d4_form.csa_name.data))
                 d14_reading = D14Reading(
                     section="D1D4",
                     d1_opening=d1_opening,
@@ -370,10 +381,13 @@ def secure_adashboard():
                     price=price,
                     total=total,
                     date_of_sale=d1d4_form.date_of_sale.data,
-                    csa_name=csa.attendant_name if csa else "",
+                    csa_name=attendant_name(d1d4_form.csa_name.data),
                     session_id=closing_session.id,
                 )
                 db.session.add(d14_reading)
+                refresh_daily_summary(
+                    closing_session.session_date, closing_session.section
+                )
                 db.session.commit()
                 flash(message="D1-D4 diesel meter reading saved!", category="success")
             except Exception as e:
@@ -554,6 +568,9 @@ def secure_adashboard():
                 )
 
                 db.session.add(credit_transaction)
+                refresh_daily_summary(
+                    closing_session.session_date, closing_session.section
+                )
                 db.session.commit()
 
                 flash(
@@ -651,6 +668,9 @@ def secure_adashboard():
 
                 # 🔹 Step 4: Commit and Notify
                 if saved_any:
+                    refresh_daily_summary(
+                        closing_session.session_date, closing_session.section
+                    )
                     db.session.commit()
                     msg_type = "Adjustment" if is_reconciliation else selected_section
                     flash(
@@ -687,6 +707,17 @@ def secure_adashboard():
 def edit_session(session_id):
     closing_session = ClosingSession.query.get_or_404(ident=session_id)
 
+    # Past sessions are only opened through the PIN-checked access control.
+    # A save is checked against the token issued when the form was opened,
+    # so it survives the grant expiring or the date rolling over meanwhile.
+    if request.method == "POST":
+        allowed = has_edit_token(request.form.get("edit_token"), closing_session.id)
+    else:
+        allowed = closing_session.session_date == date.today() or has_grant()
+    if not allowed:
+        flash(message="Admin PIN required", category="error")
+        return redirect(url_for(endpoint="super_admin_secure.secure_adashboard"))
+
     credit_tx = (
         closing_session.credit_transactions[0]
         if closing_session.credit_transactions
@@ -871,6 +902,9 @@ def edit_session(session_id):
                     f"total_credit={total_credit}, total_collection={total_collection}, cash_to_bank={cash_to_bank}"
                 )
 
+                refresh_daily_summary(
+                    closing_session.session_date, closing_session.section
+                )
                 db.session.commit()
                 flash(message="Session updated successfully ✅", category="success")
                 return redirect(
@@ -886,6 +920,7 @@ def edit_session(session_id):
     return render_template(
         "edit_session.html",
         session=closing_session,
+        edit_token=issue_edit_token(closing_session.id),
         credit_form=credit_form,
         paper_form=paper_form,
         coins_form=coins_form,
@@ -894,6 +929,19 @@ def edit_session(session_id):
     )
 
 
+@super_admin_secure.route(rule="account_mgr/slow_queries")
+@login_required
+@super_admin_required
+def slow_queries():
+    # 🐢 Recent slow statements seen by this worker, with their plans
+    return render_template(
+        "slow_queries.html",
+        queries=recent_slow_queries(),
+        threshold=current_app.config["SLOW_QUERY_THRESHOLD_MS"],
+        pid=os.getpid(),
+    )
+
+
 @super_admin_secure.route("/firebase-messaging-sw.js")
 def firebase_messaging_sw():
     return (
@@ -905,6 +953,7 @@ def firebase_messaging_sw():
 
 @super_admin_secure.route(rule="/account_mgr/admin/logout")
 def super_admin_logout():
+    revoke_grant()
     logout_user()
     flash(message="Logout Successfully", category="success")
     return redirect(url_for(endpoint="super_admin_secure.secure_superlogin"))
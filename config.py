@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -63,13 +64,45 @@ class Config:
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS = [".jpg", ".jpeg", ".png", ".pdf"]
     UPLOAD_FOLDER = os.path.abspath(os.path.join("account_mgr", "static", "media"))
+    # Uploaded images: full size plus these sizes (px, longest side), each
+    # also as WebP, rendered by IMAGE_WORKERS processes
+    IMAGE_MAX_SIZE = 750
+    IMAGE_SIZES = {"sm": 70, "md": 160}  # 2x the 35px header / 80px sidebar avatar
+    IMAGE_WORKERS = 2
+
+    # --- Reports ---
+    # Threads (and so extra DB connections) used to fetch the ALL report's
+    # models concurrently; 1 runs them one after another.
+    REPORT_PARALLELISM = int(os.getenv("REPORT_PARALLELISM", 4))
+    RESULTS_PER_PAGE = 50  # rows per result table page
+    RESULTS_MAX_PER_PAGE = 200
+
+    # --- Listings (account_mgr.database.pagination) ---
+    LISTING_COUNT_TIMEOUT = 60 * 5  # cached total row count per table
+    LISTING_ESTIMATE_THRESHOLD = 100_000  # above this, use the planner estimate
+
+    # --- Background Exports ---
+    EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.abspath("exports"))
+    EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", 2))
+    EXPORT_TTL = 60 * 60  # finished files are kept for an hour
+    EXPORT_PURGE_INTERVAL = 60 * 10
 
     # --- Cache ----
     CACHE_TYPE = "simple"
     CACHE_DEFAULT_TIMEOUT = 300
+    USER_CACHE_TIMEOUT = 60  # cached Flask-Login identity and avatar URL
 
-    # --- Flask-Session ---
-    SESSION_TYPE = "sqlalchemy"
+    # --- Sessions ---
+    # cookie | cachelib | redis | sqlalchemy, see account_mgr.session_
+    SESSION_BACKEND = os.getenv("SESSION_BACKEND", "sqlalchemy")
+    SESSION_REFRESH_EACH_REQUEST = False  # only write sessions that changed
+    SESSION_TOUCH_INTERVAL = 60 * 60 * 24  # slide the expiry at most daily
+    SESSION_PURGE_INTERVAL = 60 * 60  # expired SQL rows, 0 disables
+    SESSION_FILE_DIR = os.getenv(
+        "SESSION_FILE_DIR", os.path.join(os.getcwd(), "flask_session")
+    )
+    SESSION_FILE_THRESHOLD = 5000
+    SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
     SESSION_PERMANENT = True
     SESSION_USE_SIGNER = True
     SESSION_SQLALCHEMY_TABLE = "sessions"
@@ -79,12 +112,164 @@ class Config:
     PERMANENT_SESSION_LIFETIME = 60 * 60 * 24 * 4
     WTF_CSRF_TIME_LIMIT = 43200
 
+    # --- Database startup (account_mgr.database.startup) ---
+    # Migrate and seed on boot; off means running `flask init-db` on deploy
+    AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "True").lower() == "true"
+    DB_INIT_LOCK_KEY = 0x61636D67  # pg_advisory_lock key, "acmg"
+
+    # --- Slow queries (account_mgr.database.slow_queries) ---
+    # Statements slower than this are logged with their plan; 0 turns it off
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "250"))
+    SLOW_QUERY_LOG_SIZE = 200  # Recent slow queries kept per worker
+    SLOW_QUERY_EXPLAIN = True
+
+    # --- Admin PIN (account_mgr.access_control.pin) ---
+    PIN_GRANT_TTL = 60 * 5  # elevated access after one successful PIN check
+    SESSION_EDIT_TTL = 60 * 60 * 2  # an opened edit form can be saved for this long
+    PIN_CHECK_WORKERS = 2  # threads running bcrypt
+    PIN_CHECK_QUEUE = 8  # checks running or waiting before new ones are refused
+    PIN_CHECK_TIMEOUT = 5
+
+    # --- Security Headers ---
+    # Compiled once at startup by account_mgr.headers_.compile_security_headers
+    SECURITY_HEADERS = {
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",  # Prevent clickjacking
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    }
+    CSP_DIRECTIVES = {
+        "default-src": ["'self'"],
+        "base-uri": ["'self'"],
+        "form-action": ["'self'"],
+        "frame-ancestors": ["'none'"],
+        "object-src": ["'none'"],
+        "block-all-mixed-content": [],
+        "upgrade-insecure-requests": [],
+        "manifest-src": ["'self'"],
+        "media-src": ["'self'"],
+        "worker-src": ["'self'"],
+        "child-src": ["'self'"],
+        "script-src-attr": ["'none'"],
+        "report-uri": ["/csp-violation-report-endpoint/"],
+        "report-to": ["csp-endpoint"],
+        "script-src": [
+            "'self'",
+            "https://cdn.jsdelivr.net",
+            "https://cdnjs.cloudflare.com",
+            "https://unpkg.com",
+            "https://accounts.google.com",
+            "https://apis.google.com",
+        ],
+        "style-src": [
+            "'self'",
+            "https://cdn.jsdelivr.net",
+            "https://cdnjs.cloudflare.com",
+        ],
+        "font-src": ["'self'", "https://cdnjs.cloudflare.com"],
+        "img-src": ["'self'", "blob:", "data:"],
+        "connect-src": [
+            "'self'",
+            "https://cdn.jsdelivr.net",
+            "https://cdnjs.cloudflare.com",
+            "https://unpkg.com",
+            "https://accounts.google.com",
+            "https://apis.google.com",
+        ],
+    }
+    # Add a per-request nonce to script-src/style-src; templates use csp_nonce()
+    CSP_NONCE = os.getenv("CSP_NONCE", "False").lower() == "true"
+    PERMISSIONS_POLICY = {
+        "accelerometer": "",
+        "autoplay": "",
+        "camera": "",
+        "display-capture": "",
+        "encrypted-media": "",
+        "fullscreen": "self",
+        "geolocation": "",
+        "gyroscope": "",
+        "magnetometer": "",
+        "microphone": "",
+        "midi": "",
+        "payment": "",
+        "picture-in-picture": "self",
+        "publickey-credentials-get": "",
+        "screen-wake-lock": "",
+        "sync-xhr": "",
+        "usb": "",
+        "xr-spatial-tracking": "",
+    }
+    # Blueprint name -> {header: value}; None drops a header and a dict
+    # under "Content-Security-Policy" is merged into CSP_DIRECTIVES.
+    SECURITY_HEADERS_OVERRIDES = {}
+    # Static files only get the headers that matter for cached assets
+    STATIC_SECURITY_HEADERS = {"X-Content-Type-Options": "nosniff"}
+
+    # --- Static assets (account_mgr.assets_) ---
+    # `flask build-assets` writes hashed copies to static/dist; without a
+    # build (or with this off) the source files are served as they are
+    USE_ASSET_BUILD = os.getenv("USE_ASSET_BUILD", "True").lower() == "true"
+    ASSET_MAX_AGE = 60 * 60 * 24 * 365
+    ASSET_DIRS = ("css", "js", "fonts", "icons")
+    # Bundle name -> sources, concatenated in order
+    ASSET_BUNDLES = {
+        "css/app.bundle.css": [
+            "css/custom_model.css",
+            "css/layout.css",
+            "css/flash.css",
+            "css/transaction_report.css",
+            "css/cash_report.css",
+            "css/scroll.css",
+        ],
+        "js/app.bundle.js": [
+            "js/layout.js",
+            "js/flash_remove_dom.js",
+            "js/auto_logout.js",
+            "js/custom_report_modals.js",
+            "js/per_page.js",
+            "js/custom_model.js",
+            "js/meters.js",
+            "js/opening_meter.js",
+            "js/switch_button.js",
+            "js/delete_confirm.js",
+            "js/cash_summary.js",
+            "js/export_jobs.js",
+            "js/result_tables.js",
+        ],
+        "css/login.bundle.css": ["css/login_layout.css", "css/flash.css"],
+    }
+
+    # `flask import-budget` fails when importing account_mgr takes longer
+    IMPORT_TIME_BUDGET_MS = 1500
+
+    # --- Request metrics (account_mgr.metrics_) ---
+    # Bearer token for the Prometheus scraper on /metrics
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    # Shared by every gunicorn worker; clear it when deploying
+    METRICS_DIR = os.getenv(
+        "METRICS_DIR", os.path.join(tempfile.gettempdir(), "account_mgr_metrics")
+    )
+    METRICS_FLUSH_INTERVAL = 5
+    METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    # --- Logging ---
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+    LOG_LEVELS = {
+        "account_mgr.requests": "WARNING",  # per-request route lines are DEBUG
+        "sqlalchemy.engine": "WARNING",
+        "werkzeug": "INFO",
+    }
+
 
 class DevConfig(Config):
     """Development configuration."""
 
     FLASK_ENV = "development"
     DEBUG = True
+    USE_ASSET_BUILD = os.getenv("USE_ASSET_BUILD", "False").lower() == "true"
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "DEBUG")
+    LOG_LEVELS = {**Config.LOG_LEVELS, "account_mgr.requests": "DEBUG"}
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL_LOCAL")
     SQLALCHEMY_ENGINE_OPTIONS = {
         "connect_args": {"options": "-c timezone=Africa/Accra"}
@@ -96,7 +281,8 @@ class ProdConfig(Config):
 
     FLASK_ENV = "production"
     DEBUG = False
-    AUTO_MIGRATE = True
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS = {**Config.LOG_LEVELS, "werkzeug": "WARNING"}
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL") or os.getenv(
         "DATABASE_URL_INTERNAL"
     )
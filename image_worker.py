@@ -0,0 +1,80 @@
+"""
+Image rendering for the account_mgr upload pool.
+
+This module lives outside the account_mgr package on purpose: the pool
+starts its workers with `spawn`, and importing anything under
+account_mgr would build the whole app (engine, threads, at-fork hooks)
+inside every image worker.
+"""
+import io
+import os
+
+
+SAVE_OPTIONS = {
+    ".jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+    ".png": ("PNG", {"optimize": True}),
+    ".webp": ("WEBP", {"quality": 80, "method": 4}),
+}
+
+# Modes every format in SAVE_OPTIONS can write, with or without alpha
+OPAQUE_MODES = ("RGB", "L")
+ALPHA_MODES = ("RGBA", "LA")
+
+
+def variant_name(filename, size=None, webp=False):
+    """
+    File name of one variant of a stored image: the full-size image keeps
+    `filename`, smaller sizes get a `_<size>` suffix, WebP copies a .webp
+    extension. `<hash>.jpg` -> `<hash>_sm.webp`.
+    """
+    stem, ext = os.path.splitext(filename)
+    if size:
+        stem = f"{stem}_{size}"
+    return stem + (".webp" if webp else ext)
+
+
+def _normalize_mode(image, ext):
+    """8-bit L/RGB (plus alpha where the target keeps it) for any source."""
+    if image.mode in ("I", "I;16", "I;16B", "I;16L", "F"):
+        # 16-bit and float greyscale: scale down instead of clipping
+        image = image.convert("I").point(lambda v: v / 256).convert("L")
+    if image.mode in OPAQUE_MODES:
+        return image
+    alpha = image.mode in ALPHA_MODES or image.has_transparency_data
+    if ext == ".jpg" or not alpha:
+        return image.convert("L" if image.mode in ("LA", "1") else "RGB")
+    return image if image.mode in ALPHA_MODES else image.convert("RGBA")
+
+
+def _save(image, path, ext):
+    fmt, options = SAVE_OPTIONS[ext]
+    tmp = f"{path}.tmp"
+    image.save(tmp, fmt, **options)
+    os.replace(tmp, path)
+
+
+def render_variants(data, directory, filename, max_size, sizes):
+    """
+    Write every size of one upload, plus a WebP copy of each. Runs in the
+    process pool, so it only takes plain arguments and needs no app.
+    """
+    # Not at module level: account_mgr imports variant_name from here
+    from PIL import Image, ImageOps
+
+    ext = os.path.splitext(filename)[1]
+    targets = sorted([(None, max_size), *sizes.items()], key=lambda t: -t[1])
+
+    with Image.open(io.BytesIO(data)) as image:
+        # JPEG only: let the decoder downscale by up to 8x while reading
+        image.draft("RGB", (max_size, max_size))
+        image = _normalize_mode(ImageOps.exif_transpose(image), ext)
+
+        # Largest first, each size shrunk from the one before it
+        for size, px in targets:
+            image.thumbnail((px, px))
+            _save(image, os.path.join(directory, variant_name(filename, size)), ext)
+            _save(
+                image,
+                os.path.join(directory, variant_name(filename, size, webp=True)),
+                ".webp",
+            )
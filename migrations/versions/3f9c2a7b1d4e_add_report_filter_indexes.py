@@ -0,0 +1,45 @@
+"""add report filter indexes
+
+Revision ID: 3f9c2a7b1d4e
+Revises:
+Create Date: 2026-10-18 09:12:44.215301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2a7b1d4e'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) -- tables already exist through db.create_all(),
+# so each index is created only when missing.
+INDEXES = [
+    ('ix_closing_sessions_section_session_date', 'closing_sessions', ['section', 'session_date']),
+    ('ix_closing_sessions_date_created', 'closing_sessions', ['date_created']),
+    ('ix_meter_readings_session_id', 'meter_readings', ['session_id']),
+    ('ix_meter_readings_date_of_sale', 'meter_readings', ['date_of_sale']),
+    ('ix_meter_readings_date_created', 'meter_readings', ['date_created']),
+    ('ix_meter_readings_lower_section_date_of_sale', 'meter_readings', [sa.text('lower(section)'), 'date_of_sale']),
+    ('ix_d14_readings_session_id', 'd14_readings', ['session_id']),
+    ('ix_d14_readings_date_of_sale', 'd14_readings', ['date_of_sale']),
+    ('ix_d14_readings_date_created', 'd14_readings', ['date_created']),
+    ('ix_d14_readings_lower_section_date_of_sale', 'd14_readings', [sa.text('lower(section)'), 'date_of_sale']),
+    ('ix_credit_transactions_date_created', 'credit_transactions', ['date_created']),
+    ('ix_paper_transactions_date_created', 'paper_transactions', ['date_created']),
+    ('ix_coins_transactions_date_created', 'coins_transactions', ['date_created']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,36 @@
+"""keyset listing indexes
+
+Revision ID: 8b1e4d6c2f90
+Revises: 3f9c2a7b1d4e
+Create Date: 2026-10-18 11:32:08.540193
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b1e4d6c2f90'
+down_revision = '3f9c2a7b1d4e'
+branch_labels = None
+depends_on = None
+
+
+# (old index, new index, table, new columns) -- the listings seek on
+# (sort key, id), which the single-column indexes cannot serve in order.
+REPLACED_INDEXES = [
+    ('ix_meter_readings_date_of_sale', 'ix_meter_readings_date_of_sale_id', 'meter_readings', ['date_of_sale', 'id']),
+    ('ix_d14_readings_date_of_sale', 'ix_d14_readings_date_of_sale_id', 'd14_readings', ['date_of_sale', 'id']),
+    ('ix_closing_sessions_date_created', 'ix_closing_sessions_date_created_id', 'closing_sessions', ['date_created', 'id']),
+]
+
+
+def upgrade():
+    for old, new, table, columns in REPLACED_INDEXES:
+        op.create_index(new, table, columns, unique=False, if_not_exists=True)
+        op.drop_index(old, table_name=table, if_exists=True)
+
+
+def downgrade():
+    for old, new, table, columns in reversed(REPLACED_INDEXES):
+        op.create_index(old, table, columns[:1], unique=False, if_not_exists=True)
+        op.drop_index(new, table_name=table, if_exists=True)
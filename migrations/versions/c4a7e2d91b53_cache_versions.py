@@ -0,0 +1,29 @@
+"""cache versions
+
+Revision ID: c4a7e2d91b53
+Revises: 8b1e4d6c2f90
+Create Date: 2026-10-18 11:36:40.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a7e2d91b53'
+down_revision = '8b1e4d6c2f90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name'),
+    if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_table('cache_versions', if_exists=True)
@@ -0,0 +1,50 @@
+"""daily closing summaries
+
+Revision ID: e2d9a6b4f1c8
+Revises: c4a7e2d91b53
+Create Date: 2026-10-18 12:10:52.114306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2d9a6b4f1c8'
+down_revision = 'c4a7e2d91b53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_closing_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_date', sa.Date(), nullable=False),
+    sa.Column('section', sa.String(length=100), nullable=False),
+    sa.Column('liters_sold', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('meter_total', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_credit', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('total_collection', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('cash_to_bank', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('note_200', sa.Integer(), nullable=False),
+    sa.Column('note_100', sa.Integer(), nullable=False),
+    sa.Column('note_50', sa.Integer(), nullable=False),
+    sa.Column('note_20', sa.Integer(), nullable=False),
+    sa.Column('note_10', sa.Integer(), nullable=False),
+    sa.Column('note_5', sa.Integer(), nullable=False),
+    sa.Column('note_2', sa.Integer(), nullable=False),
+    sa.Column('note_1', sa.Integer(), nullable=False),
+    sa.Column('coin_5', sa.Integer(), nullable=False),
+    sa.Column('coin_2', sa.Integer(), nullable=False),
+    sa.Column('coin_1', sa.Integer(), nullable=False),
+    sa.Column('date_updated', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_date', 'section', name='unique_summary_per_day_section'),
+    if_not_exists=True
+    )
+    op.create_index(op.f('ix_daily_closing_summaries_session_date'), 'daily_closing_summaries', ['session_date'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_daily_closing_summaries_session_date'), table_name='daily_closing_summaries', if_exists=True)
+    op.drop_table('daily_closing_summaries', if_exists=True)
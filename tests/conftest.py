@@ -0,0 +1,173 @@
+"""
+Shared fixtures. `account_mgr` builds its app at import time, so the
+environment is set up here before anything imports it.
+
+The suite runs on a throwaway SQLite file by default. Set
+TEST_DATABASE_URL to run it against PostgreSQL instead (every table in
+that database is emptied between tests).
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+TMP_DIR = tempfile.mkdtemp(prefix="account_mgr-tests-")
+DATABASE_URL = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{TMP_DIR}/test.db"
+
+os.environ["FLASK_ENV"] = "development"
+os.environ["DATABASE_URL_LOCAL"] = DATABASE_URL
+os.environ["AUTO_MIGRATE"] = "true"
+os.environ["ADMIN_USERNAME"] = "admin"
+os.environ["ADMIN_PASSWORD"] = "admin-password"
+os.environ["EXPORT_DIR"] = os.path.join(TMP_DIR, "exports")
+os.environ["METRICS_DIR"] = os.path.join(TMP_DIR, "metrics")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import config  # noqa: E402
+
+if DATABASE_URL.startswith("sqlite"):
+    # The connect options set the PostgreSQL session timezone
+    config.DevConfig.SQLALCHEMY_ENGINE_OPTIONS = {}
+
+from account_mgr import app as flask_app, db  # noqa: E402
+from account_mgr.database.models import (  # noqa: E402
+    User,
+    CSAName,
+    D14Reading,
+    MeterReading,
+    ClosingSession,
+    CoinsTransaction,
+    PaperTransaction,
+    CreditTransaction,
+)
+
+
+@pytest.fixture(scope="session")
+def app():
+    flask_app.config.update(
+        TESTING=True, WTF_CSRF_ENABLED=False, SESSION_COOKIE_SECURE=False
+    )
+    return flask_app
+
+
+@pytest.fixture(autouse=True)
+def clean_db(app):
+    """Every test starts from the migrated schema with only the admin user."""
+    yield
+    with app.app_context():
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            if table.name != "users":
+                db.session.execute(table.delete())
+        db.session.commit()
+
+
+@pytest.fixture
+def seed(app):
+    """seed(n): add n S1S2 and n D1D4 sessions for today, with their rows."""
+
+    def seed(n):
+        with app.app_context():
+            if not CSAName.query.filter_by(attendant_name="Ama").first():
+                db.session.add(CSAName(attendant_name="Ama"))
+            for i in range(n):
+                for section in ("S1S2", "D1D4"):
+                    session = ClosingSession(
+                        section=section,
+                        admin_user_name="admin",
+                        session_date=date.today(),
+                    )
+                    db.session.add(session)
+                    db.session.flush()
+                    db.session.add(_reading(session, section))
+                    db.session.add_all(
+                        [
+                            CreditTransaction(
+                                session_id=session.id,
+                                gcb=1,
+                                momo=2,
+                                total_credit=3,
+                                total_collection=1,
+                                cash_to_bank=100,
+                                grand_total=205,
+                            ),
+                            PaperTransaction(
+                                session_id=session.id, note_200=1, note_100=2, note_1=i
+                            ),
+                            CoinsTransaction(
+                                session_id=session.id, coin_5=3, coin_2=1
+                            ),
+                        ]
+                    )
+            db.session.commit()
+
+    return seed
+
+
+def _reading(session, section):
+    common = dict(
+        session_id=session.id,
+        section=section,
+        price=10,
+        date_of_sale=date.today(),
+        csa_name="Ama",
+    )
+    if section == "S1S2":
+        return MeterReading(
+            super_1_opening=1,
+            super_2_opening=1,
+            super_1_closing=11,
+            super_2_closing=11,
+            liters_sold=Decimal("20.50"),
+            total=Decimal("205.00"),
+            **common,
+        )
+    pumps = {f"d{n}_opening": 0 for n in range(1, 5)}
+    pumps.update({f"d{n}_closing": 1 for n in range(1, 5)})
+    return D14Reading(
+        **pumps,
+        liters_sold=Decimal("4.25"),
+        total=Decimal("42.50"),
+        **common,
+    )
+
+
+@pytest.fixture
+def client(app):
+    """Test client signed in as the seeded super admin."""
+    client = app.test_client()
+    with app.app_context():
+        user_id = User.query.filter_by(is_super_admin=True).first().id
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+    return client
+
+
+@pytest.fixture
+def statements(app):
+    """
+    Context manager recording every statement the app's engine runs inside
+    it, from any thread, as (sql, parameters) pairs.
+    """
+
+    @contextmanager
+    def record():
+        seen = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+            seen.append((statement, parameters))
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield seen
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return record
@@ -0,0 +1,43 @@
+import os
+
+from flask import g, render_template_string
+
+from account_mgr.headers_ import CSP_HEADER, build_csp
+from account_mgr.lazy_ import measure_import
+
+
+def test_pages_get_each_security_header_once(app, client):
+    response = client.get("/no-such-page")
+    for key in app.config["SECURITY_HEADERS"]:
+        assert len(response.headers.getlist(key)) == 1, key
+    assert response.headers[CSP_HEADER] == build_csp(app.config["CSP_DIRECTIVES"])
+
+
+def test_static_files_get_only_static_headers(app, client):
+    response = client.get("/static/css/400.css")
+    assert response.status_code == 200
+    for key, value in app.config["STATIC_SECURITY_HEADERS"].items():
+        assert response.headers[key] == value
+    assert CSP_HEADER not in response.headers
+
+
+def test_default_forms_are_built_on_first_use_only(app):
+    with app.test_request_context():
+        render_template_string("no forms here")
+        assert "default_forms" not in g
+
+        render_template_string("{{ report.start_date.name }}")
+        built = g.default_forms["report"]
+        render_template_string("{{ report.end_date.name }}")
+        assert g.default_forms == {"report": built}
+
+
+def test_import_stays_within_budget(app, monkeypatch):
+    # No database work at import: no migrations, no session table
+    monkeypatch.setenv("AUTO_MIGRATE", "false")
+    monkeypatch.setenv("SESSION_BACKEND", "cookie")
+    elapsed, loaded = measure_import(
+        "account_mgr", cwd=os.path.dirname(app.root_path)
+    )
+    assert loaded == []
+    assert elapsed <= app.config["IMPORT_TIME_BUDGET_MS"]
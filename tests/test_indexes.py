@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, text
+
+from account_mgr import db
+from account_mgr.database.models import ClosingSession, D14Reading, MeterReading
+from account_mgr.database.slow_queries import EXPLAIN_PREFIXES
+from account_mgr.search.routes import REPORT_MODELS, ReportType, report_query
+
+START, END = date.today() - timedelta(days=1), date.today()
+
+# Report type -> index its date-range query should be served by
+REPORT_INDEXES = {
+    ReportType.METER_READING.value: "ix_meter_readings_date_of_sale_id",
+    ReportType.D14_READING.value: "ix_d14_readings_date_of_sale_id",
+    ReportType.CREDIT.value: "ix_credit_transactions_date_created",
+    ReportType.PAPER.value: "ix_paper_transactions_date_created",
+    ReportType.COINS.value: "ix_coins_transactions_date_created",
+    ReportType.CLOSING_SESSION.value: "ix_closing_sessions_date_created_id",
+}
+
+
+def plan(statements, run):
+    """EXPLAIN the first statement `run` executes, with its own parameters."""
+    with statements() as seen:
+        run()
+    statement, parameters = seen[0]
+    prefix = EXPLAIN_PREFIXES[db.engine.dialect.name]
+    with db.engine.connect() as conn:
+        if db.engine.dialect.name == "postgresql":
+            # The seeded tables are tiny; ask whether an index *can* serve
+            # the query rather than whether it beats a seq scan on 40 rows
+            conn.execute(text("SET enable_seqscan = off"))
+        rows = conn.exec_driver_sql(prefix + statement, parameters).all()
+    # SQLite rows are (id, parent, notused, detail)
+    column = -1 if db.engine.dialect.name == "sqlite" else 0
+    return "\n".join(row[column] for row in rows)
+
+
+@pytest.fixture
+def seeded(app, seed):
+    seed(20)
+    with app.app_context():
+        yield
+
+
+def test_every_report_type_has_an_index():
+    assert sorted(REPORT_INDEXES) == sorted(REPORT_MODELS)
+
+
+@pytest.mark.parametrize("report_type", sorted(REPORT_INDEXES))
+def test_report_query_uses_date_index(seeded, statements, report_type):
+    query = report_query(report_type, START, END)
+    assert REPORT_INDEXES[report_type] in plan(statements, query.all)
+
+
+def test_session_lookup_uses_section_date_index(seeded, statements):
+    query = ClosingSession.query.filter_by(section="S1S2", session_date=date.today())
+    assert "ix_closing_sessions_section_session_date" in plan(statements, query.first)
+
+
+@pytest.mark.parametrize(
+    "model, index",
+    [
+        (MeterReading, "ix_meter_readings_lower_section_date_of_sale"),
+        (D14Reading, "ix_d14_readings_lower_section_date_of_sale"),
+    ],
+)
+def test_opening_meter_lookup_uses_lower_section_index(
+    seeded, statements, model, index
+):
+    query = model.query.filter(
+        func.lower(model.section) == "s1s2", model.date_of_sale == date.today()
+    )
+    assert index in plan(statements, query.first)
+